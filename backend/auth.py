@@ -1,3 +1,8 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import Depends, HTTPException, status
@@ -6,6 +11,8 @@ from passlib.context import CryptContext
 import jwt
 import os
 
+from metrics import JWT_DECODE_LATENCY, PASSWORD_HASH_LATENCY
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -16,6 +23,8 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
 # Security scheme
 security = HTTPBearer()
+# For routes that must answer a missing token with 401 rather than HTTPBearer's 403
+optional_security = HTTPBearer(auto_error=False)
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
@@ -25,6 +34,54 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
+class PasswordHashingService:
+    """Runs bcrypt on a bounded thread pool so it never blocks the event loop"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        self._completed = 0
+
+    @staticmethod
+    def _timed(operation: str, func, *args):
+        # Timed on the worker thread so queueing for the pool is not counted
+        with PASSWORD_HASH_LATENCY.labels(operation).time():
+            return func(*args)
+
+    async def _run(self, operation: str, func, *args):
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            return await loop.run_in_executor(self._executor, self._timed, operation, func, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the worker pool"""
+        return await self._run("hash", hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the worker pool"""
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Queue depth and throughput counters for monitoring"""
+        return {
+            "workers": self.max_workers,
+            "in_flight": min(self._pending, self.max_workers),
+            "queued": max(0, self._pending - self.max_workers),
+            "completed": self._completed
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHashingService(
+    max_workers=int(os.environ.get("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -33,14 +90,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> dict:
     """Verify and decode JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with JWT_DECODE_LATENCY.time():
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -48,33 +106,97 @@ def verify_token(token: str) -> dict:
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+class PrincipalCache:
+    """Bounded LRU of decoded tokens, keyed on the token digest, valid until exp"""
+
+    def __init__(self, maxsize: int, token_lifetime: float = ACCESS_TOKEN_EXPIRE_MINUTES * 60):
+        self.maxsize = maxsize
+        self.token_lifetime = token_lifetime
+        self._entries = OrderedDict()
+        self._revoked = {}
+
+    def get(self, key: bytes) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        principal, exp = entry
+        if exp <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return principal
+
+    def put(self, key: bytes, principal: dict, exp: float):
+        self._entries[key] = (principal, exp)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def revoke_user(self, user_id: str):
+        """Reject every token issued to a user up to now and drop cached principals"""
+        now = time.time()
+        # Tokens issued before an older revocation have expired by now, so it can go
+        for stale in [uid for uid, revoked_at in self._revoked.items() if revoked_at <= now - self.token_lifetime]:
+            del self._revoked[stale]
+        self._revoked[user_id] = now
+        for key in [k for k, (principal, _) in self._entries.items() if principal["id"] == user_id]:
+            del self._entries[key]
+
+    def is_revoked(self, user_id: str, issued_at: Optional[float]) -> bool:
+        revoked_at = self._revoked.get(user_id)
+        if revoked_at is None:
+            return False
+        return issued_at is None or issued_at <= revoked_at
+
+principal_cache = PrincipalCache(maxsize=int(os.environ.get("PRINCIPAL_CACHE_SIZE", "10000")))
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Dependency to get current authenticated user"""
     token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).digest()
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return dict(principal)
+    
     payload = verify_token(token)
     
     user_id = payload.get("sub")
     role = payload.get("role")
     
-    if user_id is None:
+    if user_id is None or principal_cache.is_revoked(user_id, payload.get("iat")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
     
-    return {
+    principal = {
         "id": user_id,
         "role": role,
         "email": payload.get("email"),
         "name": payload.get("name")
     }
+    if "exp" in payload:
+        principal_cache.put(cache_key, principal, payload["exp"])
+    return dict(principal)
+
+async def require_authenticated_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> dict:
+    """Like get_current_user, but a request without a token gets 401"""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_current_user(credentials)
 
 async def get_current_admin(current_user: dict = Depends(get_current_user)) -> dict:
     """Dependency to ensure user is admin"""
@@ -0,0 +1,853 @@
+"""Load and latency benchmark for the api_router and worker_router endpoints.
+
+Seeds a dedicated database with synthetic users, jobs and ratings from the
+seed_data.py generators, drives each endpoint at a fixed concurrency through
+the ASGI app in-process (or against a running server with --url) and prints
+throughput, latency percentiles and per-request peak allocations as JSON.
+
+    python benchmark.py --jobs 10000 --requests 500 --concurrency 50
+    python benchmark.py --mock --endpoints get_jobs,login   # no mongod needed
+    python benchmark.py --output baseline.json
+    python benchmark.py --pool-sizes 5,10,25,50,100 --endpoints get_jobs,get_job
+    python benchmark.py --mix get_jobs=60,get_job=20,login=5,apply_job=5,create_job=5,trigger_sos=5
+
+Latency of one endpoint while another saturates the server:
+
+    python benchmark.py --background login:200 --endpoints root,get_job,get_schemes
+    python benchmark.py --background get_jobs:500 --endpoints trigger_sos
+
+Single-purpose studies, run after the endpoint suite:
+
+    python benchmark.py --apps server,main --concurrency 500 --endpoints worker_dashboard,trust_score
+    python benchmark.py --import-rows 100000 --endpoints root
+    python benchmark.py --stream-subscribers 200 --endpoints root
+    python benchmark.py --ratings-per-user 0,1000,100000 --endpoints create_rating
+    python benchmark.py --jobs 1000000 --radii 1,5,20,50 --endpoints get_nearby_jobs
+    python benchmark.py --scheme-counts 30,1000,10000,100000 --endpoints get_schemes
+
+Without a database:
+
+    python benchmark.py --payloads 1000,10000   # encoding CPU and wire bytes only
+    python benchmark.py --auth-calls 10000      # JWT auth dependency cost per request
+
+mongomock implements neither $geoNear, $text nor $round, so get_nearby_jobs,
+search_jobs and create_rating need a live mongod. The benchmark database
+(BENCH_DB_NAME, default swayam_benchmark) is dropped and reseeded on every run.
+"""
+import argparse
+import asyncio
+import csv
+import importlib
+import io
+import itertools
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+
+BENCH_PASSWORD = "benchpass123"
+
+# Rows per request in the bulk_import scenario
+BULK_ROWS = 100
+
+# Time given to --background load to saturate the server before measuring
+BACKGROUND_WARMUP_SECONDS = 1.0
+
+# Routes served by main.worker_router, the default set for --apps
+WORKER_ROUTER_SCENARIOS = ["onboarding_status", "trust_score", "trusted_workers", "worker_dashboard", "weekly_jobs"]
+
+JOB_CREATE_FIELDS = ("title", "category", "description", "location", "pay", "duration", "employer_id", "employer_name", "geo")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=200, help="worker users to seed")
+    parser.add_argument("--employers", type=int, default=20, help="employer users to seed")
+    parser.add_argument("--jobs", type=int, default=5000, help="open jobs to seed")
+    parser.add_argument("--ratings", type=int, default=2000, help="ratings to seed")
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent clients per endpoint")
+    parser.add_argument("--endpoints", default="", help="comma separated subset of scenarios to run")
+    parser.add_argument("--mix", default="", help="weighted scenarios for one mixed-load pass, e.g. get_jobs=70,login=10")
+    parser.add_argument("--background", default="", help="scenarios kept busy while measuring, as name:concurrency pairs")
+    parser.add_argument("--apps", default="server", help="comma separated modules whose app to drive in turn (in-process only)")
+    parser.add_argument("--alloc-samples", type=int, default=20, help="sequential requests traced for allocations (0 disables)")
+    parser.add_argument("--mock", action="store_true", help="use mongomock-motor instead of a live mongod")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--pool-sizes", default="", help="comma separated maxPoolSize values to sweep (in-process only)")
+    parser.add_argument("--payloads", default="", help="comma separated job-list sizes to encode and compress, without a database")
+    parser.add_argument("--auth-calls", type=int, default=0, help="time the JWT auth dependency over this many calls, without a database")
+    parser.add_argument("--import-rows", type=int, default=0, help="rows per bulk import upload, once as NDJSON and once as CSV")
+    parser.add_argument("--stream-subscribers", type=int, default=0, help="event stream subscribers for the SOS delivery study (in-process only)")
+    parser.add_argument("--radii", default="", help="comma separated search radii in km for the nearby-jobs study")
+    parser.add_argument("--scheme-counts", default="", help="comma separated catalog sizes for the scheme search study")
+    parser.add_argument("--ratings-per-user", default="", help="comma separated rating counts a ratee already holds, to time create_rating against")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def int_list(value: str) -> list:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def pairs(value: str, separator: str, cast) -> dict:
+    """'a=1,b=2' -> {'a': cast('1'), 'b': cast('2')}"""
+    result = {}
+    for item in value.split(","):
+        if item.strip():
+            name, _, amount = item.partition(separator)
+            result[name.strip()] = cast(amount)
+    return result
+
+
+def configure_database(args):
+    """Point database.py at the benchmark database before anything imports it"""
+    os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "swayam_benchmark")
+    import database
+
+    if args.mock:
+        from mongomock_motor import AsyncMongoMockClient
+
+        mock = AsyncMongoMockClient(tz_aware=True)
+        database.create_client = lambda *args, **options: mock
+    return database
+
+
+async def seed(db, args, rng):
+    from auth import hash_password
+    from seed_data import generate_jobs, generate_ratings, generate_schemes, generate_users
+
+    for name in ("users", "jobs", "ratings", "safety_policies", "sos_alerts", "schemes", "daily_rollups"):
+        await db[name].delete_many({})
+
+    password_hash = hash_password(BENCH_PASSWORD)
+    workers = list(generate_users(args.workers, "worker", password_hash, rng))
+    employers = list(generate_users(args.employers, "employer", password_hash, rng))
+    admin = next(generate_users(1, "admin", password_hash, rng))
+    await db.users.insert_many(workers + employers + [admin])
+
+    jobs = []
+    batch = []
+    for job in generate_jobs(args.jobs, employers, rng):
+        jobs.append(job["id"])
+        batch.append(job)
+        if len(batch) == 1000:
+            await db.jobs.insert_many(batch)
+            batch = []
+    if batch:
+        await db.jobs.insert_many(batch)
+
+    ratings = list(generate_ratings(args.ratings, workers, employers, rng))
+    if ratings:
+        await db.ratings.insert_many(ratings)
+
+    await db.schemes.insert_many(list(generate_schemes(30, rng)))
+    return {"workers": workers, "employers": employers, "admin": admin, "jobs": jobs}
+
+
+def rating_request(rater, ratee, rng):
+    return "POST", "/api/ratings", {"json": {
+        "job_id": str(uuid.uuid4()),
+        "job_title": "Benchmark job",
+        "rater_id": rater["id"],
+        "rater_name": rater["name"],
+        "rater_role": rater["role"],
+        "ratee_id": ratee["id"],
+        "ratee_name": ratee["name"],
+        "ratee_role": ratee["role"],
+        "rating": rng.randint(1, 5),
+    }}
+
+
+def bearer(user):
+    from auth import create_access_token
+
+    token = create_access_token({"sub": user["id"], "email": user["email"], "role": user["role"], "name": user["name"]})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def upload_rows(count: int, employers: list, rng):
+    """Bulk import rows; the employer comes from the uploader's token"""
+    from seed_data import generate_jobs
+
+    for job in generate_jobs(count, employers, rng):
+        lng, lat = job["geo"]["coordinates"]
+        yield {
+            "title": job["title"],
+            "category": job["category"],
+            "description": job["description"],
+            "location": job["location"],
+            "pay": job["pay"],
+            "duration": job["duration"],
+            "lat": lat,
+            "lng": lng,
+        }
+
+
+def nearby_request(radius: float, rng):
+    from seed_data import LAT_RANGE, LNG_RANGE
+
+    return "GET", "/api/jobs/nearby", {"params": {
+        "lat": rng.uniform(*LAT_RANGE), "lng": rng.uniform(*LNG_RANGE), "radius": radius
+    }}
+
+
+def build_scenarios(data, rng):
+    """name -> callable(i) returning (method, url, request kwargs)"""
+    from seed_data import CATEGORIES, generate_jobs
+
+    workers, employers, jobs = data["workers"], data["employers"], data["jobs"]
+    employer_auth = bearer(employers[0])
+    admin_auth = bearer(data["admin"])
+    open_jobs = list(jobs)
+    rng.shuffle(open_jobs)
+    # One token per worker, so repeat requests hit the principal cache
+    worker_tokens = {}
+
+    def worker_auth(i):
+        worker = workers[i % len(workers)]
+        if worker["id"] not in worker_tokens:
+            worker_tokens[worker["id"]] = bearer(worker)
+        return worker_tokens[worker["id"]]
+
+    def apply(i):
+        job_id = open_jobs.pop() if open_jobs else rng.choice(jobs)
+        worker = workers[i % len(workers)]
+        return "POST", f"/api/jobs/{job_id}/apply", {
+            "json": {"worker_id": worker["id"], "worker_name": worker["name"]},
+            # Workers may only apply for themselves
+            "headers": worker_auth(i),
+        }
+
+    def create_job(i):
+        job = next(generate_jobs(1, employers[:1], rng))
+        return "POST", "/api/jobs", {
+            "json": {field: job[field] for field in JOB_CREATE_FIELDS},
+            "headers": employer_auth,
+        }
+
+    def bulk_import(i):
+        body = "\n".join(json.dumps(row) for row in upload_rows(BULK_ROWS, employers, rng))
+        return "POST", "/api/jobs/bulk", {
+            "content": body.encode(),
+            "headers": {**employer_auth, "Content-Type": "application/x-ndjson"},
+        }
+
+    def register(i):
+        return "POST", "/api/auth/register", {"json": {
+            "name": f"Registered {i}",
+            "email": f"register-{uuid.uuid4().hex}@bench.swayam",
+            "phone": f"+91-{8000000000 + i}",
+            "password": BENCH_PASSWORD,
+            "role": "worker",
+        }}
+
+    def trigger_sos(i):
+        worker = workers[i % len(workers)]
+        return "POST", "/api/sos/trigger", {"json": {
+            "worker_id": worker["id"],
+            "worker_name": worker["name"],
+            "location": "Koramangala, Bangalore",
+            "emergency_type": "harassment",
+        }}
+
+    def worker_email(i):
+        return workers[i % len(workers)]["email"]
+
+    return {
+        "root": lambda i: ("GET", "/api/", {}),
+        "get_jobs": lambda i: ("GET", "/api/jobs", {"params": {"limit": 100}}),
+        "get_jobs_open_category": lambda i: ("GET", "/api/jobs", {"params": {"status": "open", "category": "Cleaning"}}),
+        "get_job": lambda i: ("GET", f"/api/jobs/{rng.choice(jobs)}", {}),
+        "get_nearby_jobs": lambda i: nearby_request(5, rng),
+        "search_jobs": lambda i: ("GET", "/api/search/jobs", {"params": {"q": rng.choice(CATEGORIES).lower()}}),
+        "get_employer_jobs": lambda i: ("GET", f"/api/jobs/employer/{rng.choice(employers)['id']}", {}),
+        "get_workers": lambda i: ("GET", "/api/workers", {}),
+        "get_worker": lambda i: ("GET", f"/api/workers/{rng.choice(workers)['id']}", {}),
+        "get_user_ratings": lambda i: ("GET", f"/api/ratings/user/{rng.choice(workers)['id']}", {}),
+        "get_recommended_jobs": lambda i: ("GET", f"/api/jobs/recommended/{rng.choice(workers)['id']}", {}),
+        "get_schemes": lambda i: ("GET", "/api/schemes", {}),
+        "get_impact_stats": lambda i: ("GET", "/api/stats/impact", {}),
+        "get_admin_stats": lambda i: ("GET", "/api/admin/stats", {"headers": admin_auth}),
+        "get_all_users": lambda i: ("GET", "/api/admin/users", {"headers": admin_auth}),
+        "auth_me": lambda i: ("GET", "/api/auth/me", {"headers": employer_auth}),
+        "login": lambda i: ("POST", "/api/auth/login", {
+            "json": {"email": workers[i % len(workers)]["email"], "password": BENCH_PASSWORD}
+        }),
+        "register": register,
+        "create_job": create_job,
+        "bulk_import": bulk_import,
+        "apply_job": apply,
+        "create_rating": lambda i: rating_request(rng.choice(employers), workers[i % len(workers)], rng),
+        "trigger_sos": trigger_sos,
+        # main.worker_router
+        "onboarding_status": lambda i: ("GET", "/api/onboarding/status", {
+            "params": {"email": worker_email(i)}, "headers": worker_auth(i)
+        }),
+        "trust_score": lambda i: ("GET", f"/api/trust-score/{worker_email(i)}", {"headers": worker_auth(i)}),
+        "trusted_workers": lambda i: ("GET", "/api/trust-score", {"params": {"min_score": 60}, "headers": employer_auth}),
+        "worker_dashboard": lambda i: ("GET", f"/api/dashboard/{worker_email(i)}", {"headers": worker_auth(i)}),
+        "weekly_jobs": lambda i: ("GET", f"/api/weekly-jobs/{worker_email(i)}", {"headers": worker_auth(i)}),
+    }
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def run_requests(client, pick, concurrency, total=None, stop=None) -> tuple:
+    """Drive `pick(i) -> (name, method, url, kwargs)` from `concurrency` clients.
+
+    Runs `total` requests, or until `stop` is set. Returns per-name samples
+    {name: (latencies, statuses)} and the elapsed seconds.
+    """
+    samples = {}
+    counter = iter(range(total)) if total is not None else itertools.count()
+
+    async def worker():
+        for i in counter:
+            if stop is not None and stop.is_set():
+                break
+            name, method, url, kwargs = pick(i)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies, statuses = samples.setdefault(name, ([], {}))
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            # mongomock never suspends, so without this one client could hold the loop
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def latency_ms(latencies) -> dict:
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        "mean": round(statistics.fmean(ms), 3),
+        "p50": round(percentile(ms, 0.50), 3),
+        "p95": round(percentile(ms, 0.95), 3),
+        "p99": round(percentile(ms, 0.99), 3),
+        "max": round(max(ms), 3),
+    }
+
+
+def summarize(latencies, statuses, elapsed) -> dict:
+    if not latencies:
+        return {"requests": 0}
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for code, count in statuses.items() if code >= 500),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": latency_ms(latencies),
+    }
+
+
+async def run_scenario(client, build, total, concurrency):
+    samples, elapsed = await run_requests(client, lambda i: (None, *build(i)), concurrency, total)
+    return summarize(*samples.get(None, ([], {})), elapsed)
+
+
+async def run_mix(client, scenarios, weights: dict, total, concurrency, rng) -> dict:
+    """One pass with each request drawn from `weights`, reported overall and per endpoint"""
+    names = list(weights)
+
+    def pick(i):
+        name = rng.choices(names, [weights[name] for name in names])[0]
+        return (name, *scenarios[name](i))
+
+    samples, elapsed = await run_requests(client, pick, concurrency, total)
+    overall_latencies = [latency for latencies, _ in samples.values() for latency in latencies]
+    overall_statuses = {}
+    for _, statuses in samples.values():
+        for code, count in statuses.items():
+            overall_statuses[code] = overall_statuses.get(code, 0) + count
+    return {
+        "overall": summarize(overall_latencies, overall_statuses, elapsed),
+        "endpoints": {name: summarize(*samples[name], elapsed) for name in names if name in samples},
+    }
+
+
+async def trace_allocations(client, build, samples):
+    """Peak bytes allocated while serving each request, measured one at a time"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(samples):
+            method, url, kwargs = build(i)
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await client.request(method, url, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return {"p50": percentile(peaks, 0.50), "max": max(peaks)}
+
+
+def cpu_ms(encode, repeat: int = 5) -> float:
+    """Median CPU time of one call, in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        encode()
+        samples.append((time.process_time() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def payload_benchmark(sizes, rng) -> dict:
+    """Serialization CPU and bytes on the wire for /api/jobs-style list bodies"""
+    import json
+
+    import orjson
+    from fastapi.encoders import jsonable_encoder
+
+    from compression import brotli, compress
+    from seed_data import generate_jobs, generate_users
+    from serialization import dumps
+    from server import Job, job_rows
+
+    employers = list(generate_users(20, "employer", "", rng))
+    results = {}
+    for size in sizes:
+        docs = list(generate_jobs(size, employers, rng))
+        body = dumps([job_rows.row(doc) for doc in docs])
+        result = {
+            "serialize_cpu_ms": {
+                # FastAPI's default path for response_model=List[Job]
+                "response_model_json": cpu_ms(lambda: json.dumps(jsonable_encoder([Job(**doc) for doc in docs])).encode()),
+                "response_model_orjson": cpu_ms(lambda: orjson.dumps(jsonable_encoder([Job(**doc) for doc in docs]))),
+                # RowSerializer fast path used by the list endpoints
+                "row_serializer_orjson": cpu_ms(lambda: dumps([job_rows.row(doc) for doc in docs])),
+            },
+            "bytes": {"identity": len(body)},
+            "compress_cpu_ms": {},
+        }
+        for encoding in ("gzip", "br") if brotli is not None else ("gzip",):
+            result["bytes"][encoding] = len(compress(body, encoding))
+            result["compress_cpu_ms"][encoding] = cpu_ms(lambda: compress(body, encoding))
+        results[f"{size}_rows"] = result
+    return results
+
+
+async def ratings_per_user_benchmark(client, db, data, counts, args, rng) -> dict:
+    """create_rating latency against ratees that already hold `count` ratings.
+
+    The running aggregates make the write independent of a ratee's history,
+    so latency should stay flat as the count grows.
+    """
+    from seed_data import generate_ratings, generate_users
+
+    results = {}
+    for count in counts:
+        ratee = {**next(generate_users(1, "worker", "", rng)), "email": f"ratee{count}@bench.swayam"}
+        total = 0
+        batch = []
+        for rating in generate_ratings(count, [ratee], data["employers"], rng):
+            total += rating["rating"]
+            batch.append(rating)
+            if len(batch) == 1000:
+                await db.ratings.insert_many(batch)
+                batch = []
+        if batch:
+            await db.ratings.insert_many(batch)
+        await db.users.insert_one({
+            **ratee,
+            "rating_sum": total,
+            "total_ratings": count,
+            "average_rating": round(total / count, 1) if count else 0.0,
+        })
+        build = lambda i: rating_request(rng.choice(data["employers"]), ratee, rng)
+        results[f"{count}_ratings"] = await run_scenario(client, build, args.requests, args.concurrency)
+        print(f"create_rating @ {count} ratings: p99 {results[f'{count}_ratings']['latency_ms']['p99']} ms", file=sys.stderr)
+    return results
+
+
+async def radius_benchmark(client, radii, args, rng) -> dict:
+    """get_nearby_jobs latency and first-page fill per search radius, over the seeded --jobs"""
+    results = {}
+    for radius in radii:
+        result = await run_scenario(client, lambda i: nearby_request(radius, rng), args.requests, args.concurrency)
+        method, url, kwargs = nearby_request(radius, rng)
+        sample = await client.request(method, url, **kwargs)
+        if sample.status_code == 200:
+            result["first_page_jobs"] = len(sample.json())
+            result["more_pages"] = "x-next-cursor" in sample.headers
+        results[f"{radius:g}_km"] = result
+        print(f"nearby {radius:g} km: p99 {result['latency_ms']['p99']} ms", file=sys.stderr)
+    return results
+
+
+async def scheme_catalog_benchmark(db, counts, queries: int, rng) -> dict:
+    """Reload cost, body size and search/autocomplete latency of SchemeCatalog per catalog size"""
+    from scheme_catalog import SchemeCatalog, bump_catalog_version
+    from seed_data import SCHEME_WORDS, generate_schemes
+    from server import Scheme
+
+    async def timed(call, arguments) -> list:
+        latencies = []
+        for argument in arguments:
+            started = time.perf_counter()
+            await call(argument)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    results = {}
+    for count in counts:
+        await db.schemes.delete_many({})
+        schemes = generate_schemes(count, rng)
+        while batch := list(itertools.islice(schemes, 1000)):
+            await db.schemes.insert_many(batch)
+        await bump_catalog_version(db)
+
+        catalog = SchemeCatalog(db, Scheme)
+        started = time.perf_counter()
+        await catalog.ensure_fresh()
+        reload = time.perf_counter() - started
+        body, _ = await catalog.list()
+
+        searches = [" ".join(rng.sample(SCHEME_WORDS, rng.randint(1, 3))) for _ in range(queries)]
+        prefixes = [rng.choice(SCHEME_WORDS)[:rng.randint(1, 3)] for _ in range(queries)]
+        results[f"{count}_schemes"] = {
+            "reload_ms": round(reload * 1000, 3),
+            "list_body_bytes": len(body),
+            "search_ms": latency_ms(await timed(catalog.search, searches)),
+            "autocomplete_ms": latency_ms(await timed(catalog.autocomplete, prefixes)),
+        }
+        print(f"catalog of {count} schemes: reload {results[f'{count}_schemes']['reload_ms']} ms", file=sys.stderr)
+    return results
+
+
+async def run_suite(client, scenarios, selected, args) -> dict:
+    """One pass per selected endpoint, or one --mix pass, beside any --background load"""
+    background_load = pairs(args.background, ":", int)
+    stop = asyncio.Event()
+    background = {
+        name: asyncio.create_task(run_requests(
+            client, lambda i, name=name: (name, *scenarios[name](i)), concurrency, stop=stop
+        ))
+        for name, concurrency in background_load.items()
+    }
+    if background:
+        await asyncio.sleep(BACKGROUND_WARMUP_SECONDS)
+
+    results = {}
+    try:
+        if args.mix:
+            results["mixed"] = await run_mix(
+                client, scenarios, pairs(args.mix, "=", float), args.requests, args.concurrency, random.Random(args.seed)
+            )
+            print(f"mixed: {results['mixed']['overall']['throughput_rps']} req/s", file=sys.stderr)
+        for name in selected if not args.mix else []:
+            build = scenarios[name]
+            result = await run_scenario(client, build, args.requests, args.concurrency)
+            # tracemalloc would slow the background load down with it
+            if args.alloc_samples and not background:
+                result["alloc_peak_bytes"] = await trace_allocations(client, build, args.alloc_samples)
+            results[name] = result
+            print(f"{name}: {result['throughput_rps']} req/s, p99 {result['latency_ms']['p99']} ms", file=sys.stderr)
+    finally:
+        stop.set()
+    for name, task in background.items():
+        samples, elapsed = await task
+        results.setdefault("background", {})[name] = summarize(*samples.get(name, ([], {})), elapsed)
+    return results
+
+
+async def auth_benchmark(calls: int) -> dict:
+    """Per-request cost of the JWT auth dependency, with and without the principal cache"""
+    import httpx
+    from fastapi import Depends, FastAPI
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from auth import get_current_employer, get_current_user
+
+    employers = [{"id": f"employer-{i}", "email": f"employer{i}@bench.swayam", "role": "employer", "name": "Employer"}
+                 for i in range(calls + 1)]
+    # A distinct token per call never hits the cache
+    cold = [bearer(employer)["Authorization"].split()[1] for employer in employers[1:]]
+    warm_headers = bearer(employers[0])
+
+    async def per_call(tokens) -> float:
+        started = time.perf_counter()
+        for token in tokens:
+            await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+        return (time.perf_counter() - started) / len(tokens)
+
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_route():
+        return {}
+
+    @app.get("/employer")
+    async def employer_route(current_user: dict = Depends(get_current_employer)):
+        return {}
+
+    async def per_request(path: str, headers: dict) -> float:
+        started = time.perf_counter()
+        for _ in range(calls):
+            await client.get(path, headers=headers)
+        return (time.perf_counter() - started) / calls
+
+    decode = await per_call(cold)
+    cached = await per_call([warm_headers["Authorization"].split()[1]] * calls)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        await client.get("/employer", headers=warm_headers)
+        open_request = await per_request("/open", {})
+        protected_request = await per_request("/employer", warm_headers)
+    return {
+        "calls": calls,
+        "dependency_uncached_us": round(decode * 1e6, 2),
+        "dependency_cached_us": round(cached * 1e6, 2),
+        "open_request_us": round(open_request * 1e6, 2),
+        "employer_request_us": round(protected_request * 1e6, 2),
+        "overhead_us": round((protected_request - open_request) * 1e6, 2),
+    }
+
+
+async def import_benchmark(client, data, rows: int, rng) -> dict:
+    """One bulk upload of `rows` jobs per format, streamed to /api/jobs/bulk"""
+    employer = data["employers"][0]
+    results = {}
+    for content_type in ("application/x-ndjson", "text/csv"):
+        async def body():
+            chunk = io.StringIO()
+            writer = None
+            for i, row in enumerate(upload_rows(rows, data["employers"], rng), 1):
+                if content_type == "text/csv":
+                    if writer is None:
+                        writer = csv.DictWriter(chunk, fieldnames=list(row))
+                        writer.writeheader()
+                    writer.writerow(row)
+                else:
+                    chunk.write(json.dumps(row) + "\n")
+                if i % 1000 == 0:
+                    yield chunk.getvalue().encode()
+                    chunk.seek(0)
+                    chunk.truncate()
+            yield chunk.getvalue().encode()
+
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/jobs/bulk", content=body(), headers={**bearer(employer), "Content-Type": content_type}
+        )
+        elapsed = time.perf_counter() - started
+        report = response.json()
+        results[content_type] = {
+            "status": response.status_code,
+            "rows": report.get("rows"),
+            "inserted": report.get("inserted"),
+            "failed": report.get("failed"),
+            "server_rows_per_second": report.get("rows_per_second"),
+            "wall_seconds": round(elapsed, 3),
+        }
+        print(f"import {rows} rows as {content_type}: {elapsed:.1f} s", file=sys.stderr)
+    return results
+
+
+class EventStream:
+    """An SSE subscription on the in-process app.
+
+    httpx's ASGI transport buffers whole response bodies, so the stream is
+    driven at the ASGI level and stamps the arrival of each data frame.
+    """
+
+    def __init__(self, app, path: str, query: str, headers: dict):
+        self.frames = asyncio.Queue()
+        self.status = None
+        self._requested = False
+        self._started = asyncio.Event()
+        self._closed = asyncio.Event()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"benchmark")] + [
+                (name.lower().encode(), value.encode()) for name, value in headers.items()
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("benchmark", 80),
+        }
+        self._task = asyncio.create_task(app(scope, self._receive, self._send))
+
+    async def _receive(self):
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._closed.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self._started.set()
+        elif b"data:" in message.get("body", b""):
+            self.frames.put_nowait(time.perf_counter())
+
+    async def opened(self) -> bool:
+        await self._started.wait()
+        return self.status == 200
+
+    async def close(self):
+        self._closed.set()
+        await self._task
+
+
+async def events_benchmark(app, client, data, subscribers: int, alerts: int) -> dict:
+    """Latency from triggering an SOS to its frame arriving on the worker's event stream"""
+    rng = random.Random(0)
+    workers = data["workers"][:subscribers]
+    streams = [EventStream(app, "/api/events/stream", "topics=sos", bearer(worker)) for worker in workers]
+    try:
+        opened = [await stream.opened() for stream in streams]
+        if not all(opened):
+            return {"error": f"{opened.count(False)} of {len(streams)} subscriptions were refused"}
+        latencies = []
+
+        async def subscriber(worker, stream):
+            for _ in range(max(1, alerts // len(streams))):
+                started = time.perf_counter()
+                await client.post("/api/sos/trigger", json={
+                    "worker_id": worker["id"],
+                    "worker_name": worker["name"],
+                    "location": "Koramangala, Bangalore",
+                    "emergency_type": rng.choice(["harassment", "medical", "unsafe_location"]),
+                })
+                latencies.append(await asyncio.wait_for(stream.frames.get(), 30) - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(subscriber(worker, stream) for worker, stream in zip(workers, streams)))
+        result = summarize(latencies, {200: len(latencies)}, time.perf_counter() - started)
+    finally:
+        for stream in streams:
+            await stream.close()
+    return {"subscribers": len(streams), "delivery": result}
+
+
+def emit(report: dict, args):
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+async def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    offline = {}
+    if args.payloads:
+        offline["payloads"] = payload_benchmark(int_list(args.payloads), rng)
+    if args.auth_calls:
+        offline["auth_dependency"] = await auth_benchmark(args.auth_calls)
+    if offline:
+        emit(offline, args)
+        return
+    database = configure_database(args)
+    pool_sizes = int_list(args.pool_sizes)
+    apps = [name.strip() for name in args.apps.split(",") if name.strip()]
+    if args.url and (pool_sizes or apps != ["server"] or args.stream_subscribers):
+        sys.exit("--pool-sizes, --apps and --stream-subscribers drive the in-process app and cannot be combined with --url")
+
+    import httpx
+
+    # One INFO line per request would dominate the in-process client's cost
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    database.connect()
+    data = await seed(database.db, args, rng)
+    # Built once, so apply_job keeps claiming fresh jobs across passes
+    scenarios = build_scenarios(data, rng)
+    default = WORKER_ROUTER_SCENARIOS if len(apps) > 1 else list(scenarios)
+    selected = [name.strip() for name in args.endpoints.split(",") if name.strip()] or default
+    unknown = (set(selected) | set(pairs(args.mix, "=", str)) | set(pairs(args.background, ":", str))) - set(scenarios)
+    if unknown:
+        sys.exit(f"Unknown endpoints: {', '.join(sorted(unknown))}. Choose from: {', '.join(scenarios)}")
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": {},
+    }
+    ratings_per_user = int_list(args.ratings_per_user)
+
+    async def studies(client, app=None):
+        """The single-purpose benchmarks, run once after the endpoint suite"""
+        if ratings_per_user:
+            report["create_rating_by_ratings_per_user"] = await ratings_per_user_benchmark(
+                client, database.db, data, ratings_per_user, args, rng
+            )
+        if args.radii:
+            report["nearby_jobs_by_radius"] = await radius_benchmark(
+                client, [float(radius) for radius in args.radii.split(",") if radius.strip()], args, rng
+            )
+        if args.scheme_counts:
+            report["scheme_catalog"] = await scheme_catalog_benchmark(
+                database.db, int_list(args.scheme_counts), args.requests, rng
+            )
+        if args.import_rows:
+            report["bulk_import"] = await import_benchmark(client, data, args.import_rows, rng)
+        if args.stream_subscribers and app is not None:
+            report["events_stream"] = await events_benchmark(
+                app, client, data, args.stream_subscribers, args.requests
+            )
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            report["results"] = await run_suite(client, scenarios, selected, args)
+            await studies(client)
+        database.close()
+        emit(report, args)
+        return
+
+    for module in apps:
+        app = importlib.import_module(module).app
+        # Both apps share main's process-wide dashboard cache; give each a cold start
+        importlib.import_module("main").dashboard_cache.invalidate()
+        # A 500 from an unsupported mongomock operator is counted, not raised
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        results = {}
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+                if not pool_sizes:
+                    results = await run_suite(client, scenarios, selected, args)
+                for pool_size in pool_sizes:
+                    # Reconnect the shared client with this pool size; the app resolves it per request
+                    database.close()
+                    database.connect(maxPoolSize=pool_size)
+                    database.pool_monitors["main"].reset_peaks()
+                    print(f"maxPoolSize={pool_size}", file=sys.stderr)
+                    endpoints = await run_suite(client, scenarios, selected, args)
+                    results[f"maxPoolSize={pool_size}"] = {
+                        "pool": database.pool_monitors["main"].stats(),
+                        "endpoints": endpoints,
+                    }
+                report["pools"] = {name: monitor.stats() for name, monitor in database.pool_monitors.items()}
+                if module == apps[0]:
+                    await studies(client, app)
+        if len(apps) > 1:
+            report["results"][f"app={module}"] = results
+        else:
+            report["results"] = results
+
+    emit(report, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+"""Streaming bulk import of jobs from JSON, NDJSON or CSV request bodies.
+
+Rows are parsed as the body streams in, validated in batches and written
+with unordered `insert_many` per chunk, so one bad row never blocks the rest
+and memory stays bounded by the chunk size.
+"""
+import codecs
+import csv
+import json
+import time
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class UploadError(ValueError):
+    """The upload as a whole is unusable (e.g. a JSON body that is not an array)"""
+
+
+class RowError:
+    """Stands in for a row that could not be parsed, so later rows still import"""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+async def iter_lines(stream):
+    """Decode a byte stream into text lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_csv_rows(lines):
+    header = None
+    record = ""
+    async for line in lines:
+        record = f"{record}\n{line}" if record else line
+        # A quoted field is still open; keep reading lines into this record
+        if record.count('"') % 2:
+            continue
+        if record.strip():
+            values = next(csv.reader([record]))
+            if header is None:
+                header = [h.strip() for h in values]
+            else:
+                yield {k: v for k, v in zip(header, values) if v != ""}
+        record = ""
+
+
+async def iter_ndjson_rows(lines):
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield RowError(f"line {line_number}: invalid JSON ({exc.msg})")
+
+
+async def iter_rows(request):
+    """Rows of a bulk upload, chosen by Content-Type"""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "text/csv":
+        async for row in iter_csv_rows(iter_lines(request.stream())):
+            yield row
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        async for row in iter_ndjson_rows(iter_lines(request.stream())):
+            yield row
+    else:
+        try:
+            rows = json.loads(await request.body())
+        except json.JSONDecodeError as exc:
+            raise UploadError(f"Invalid JSON body: {exc.msg}")
+        if not isinstance(rows, list):
+            raise UploadError("Expected a JSON array of jobs")
+        for row in rows:
+            yield row
+
+
+def _error_text(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+    return str(exc)
+
+
+class BulkJobImport:
+    def __init__(self, collection, build_job, on_inserted=None):
+        """`build_job(row)` returns a Job model or raises; `on_inserted(jobs)` runs per chunk"""
+        self.collection = collection
+        self.build_job = build_job
+        self.on_inserted = on_inserted
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+        self._rows = 0
+        self._chunk = []
+
+    def _fail(self, row_number: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": message})
+
+    async def _flush(self):
+        chunk, self._chunk = self._chunk, []
+        if not chunk:
+            return
+        docs = [job.model_dump() for _, job in chunk]
+        failed_indexes = set()
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                failed_indexes.add(error["index"])
+                self._fail(chunk[error["index"]][0], error.get("errmsg", "write failed"))
+
+        written = [job for i, (_, job) in enumerate(chunk) if i not in failed_indexes]
+        self.inserted += len(written)
+        if written and self.on_inserted:
+            await self.on_inserted(written)
+
+    async def add(self, row):
+        self._rows += 1
+        if isinstance(row, RowError):
+            self._fail(self._rows, row.message)
+            return
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("Each row must be an object")
+            job = self.build_job(row)
+        except (ValidationError, ValueError, TypeError) as exc:
+            self._fail(self._rows, _error_text(exc))
+            return
+        self._chunk.append((self._rows, job))
+        if len(self._chunk) >= CHUNK_SIZE:
+            await self._flush()
+
+    async def run(self, rows) -> dict:
+        started = time.perf_counter()
+        try:
+            async for row in rows:
+                await self.add(row)
+        except UploadError:
+            raise
+        except (ValueError, csv.Error) as exc:
+            # Malformed body: keep what was already imported and report where it stopped
+            self._fail(self._rows + 1, f"Could not parse upload: {exc}")
+        await self._flush()
+        elapsed = time.perf_counter() - started
+        return {
+            "rows": self._rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(self._rows / elapsed, 1) if elapsed > 0 else None
+        }
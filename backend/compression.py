@@ -0,0 +1,159 @@
+"""Negotiated gzip / brotli response compression.
+
+`CompressionMiddleware` compresses responses of at least `minimum_size`
+bytes with the best encoding the client accepts: brotli when the `brotli`
+package is installed, else gzip. Already-encoded responses and event
+streams pass through untouched. The decision is made on the response
+headers, so streamed responses (no Content-Length) start immediately.
+"""
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+# Event streams must reach the client frame by frame
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def accepted_encodings(header: str) -> set:
+    """Encodings with a non-zero q-value in an Accept-Encoding header"""
+    accepted = set()
+    for part in header.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def choose_encoding(header: str):
+    accepted = accepted_encodings(header)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits 31: zlib stream with a gzip header and trailer
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress and flush one chunk, so the client can decode it as it arrives"""
+        if self._brotli:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._brotli:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        def compressed_headers(headers: dict) -> list:
+            response_headers = [
+                (name, value) for name, value in start["headers"]
+                if name.lower() not in (b"content-length", b"etag")
+            ]
+            response_headers.append((b"content-encoding", encoding.encode()))
+            response_headers.append((b"vary", b"Accept-Encoding"))
+            if b"etag" in headers:
+                # The encoded bytes differ from the identity representation
+                etag = headers[b"etag"]
+                response_headers.append((b"etag", etag if etag.startswith(b"W/") else b"W/" + etag))
+            return response_headers
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                headers = {name.lower(): value for name, value in start["headers"]}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                length = headers.get(b"content-length")
+                if (
+                    b"content-encoding" in headers
+                    or content_type.startswith(UNCOMPRESSED_TYPES)
+                    or (length is not None and int(length) < self.minimum_size)
+                    # No body to compress
+                    or scope["method"] == "HEAD"
+                    or start["status"] < 200 or start["status"] in (204, 304)
+                ):
+                    passthrough = True
+                    await send(start)
+                elif length is None:
+                    # Streaming response: compress chunk by chunk without holding back the headers
+                    compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                    await send({**start, "headers": compressed_headers(headers)})
+                # Otherwise held back until the body, to send the compressed Content-Length
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = {name.lower(): value for name, value in start["headers"]}
+                if not more_body:
+                    body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                    response_headers = compressed_headers(headers)
+                    response_headers.append((b"content-length", str(len(body)).encode()))
+                    await send({**start, "headers": response_headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                await send({**start, "headers": compressed_headers(headers)})
+
+            if more_body and not body:
+                return
+            chunk = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,5 +1,4 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timezone
@@ -7,6 +6,7 @@ import uuid
 import sys
 sys.path.append('/app/backend')
 from auth import hash_password
+from database import create_client
 
 load_dotenv()
 
@@ -14,7 +14,7 @@ mongo_url = os.environ['MONGO_URL']
 db_name = os.environ['DB_NAME']
 
 async def create_admin():
-    client = AsyncIOMotorClient(mongo_url)
+    client = create_client(mongo_url)
     db = client[db_name]
     
     # Check if admin already exists
@@ -35,7 +35,7 @@ async def create_admin():
         "role": "admin",
         "verified": True,
         "rating": 5.0,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": datetime.now(timezone.utc),
         "skills": [],
         "verifications": {
             "phone_verified": True,
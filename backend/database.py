@@ -1,17 +1,144 @@
-from pymongo import MongoClient
+from contextlib import asynccontextmanager
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern
+from pymongo.read_preferences import SecondaryPreferred
+from pathlib import Path
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+from metrics import PoolMonitor, command_timer
+from profiler import QueryProfiler
 
-MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+load_dotenv(Path(__file__).parent / '.env')
+
+# MONGO_URI is the legacy name used by main.py deployments
+MONGO_URL = os.getenv("MONGO_URL") or os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "swayam_db")
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
+# How far behind the primary a secondary may be and still serve replica reads (driver minimum 90)
+MAX_STALENESS_SECONDS = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90"))
+
+# Opt-in query-shape profiler (QUERY_PROFILER=1), shared by both clients
+query_profiler = QueryProfiler.from_env()
+
+# Client option -> (environment variable, type); unset variables keep the driver default
+CLIENT_OPTIONS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", int),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", int),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", int),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", int),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", int),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", int),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", int),
+    # e.g. "zstd,snappy"; needs the zstandard / python-snappy packages
+    "compressors": ("MONGO_COMPRESSORS", str),
+    "readPreference": ("MONGO_READ_PREFERENCE", str),
+}
+
+# Pool name -> saturation monitor, one per client created by create_client
+pool_monitors = {}
+
+
+def client_options(**overrides) -> dict:
+    """Pool, timeout, compression and read preference options from the environment"""
+    options = {}
+    for option, (variable, cast) in CLIENT_OPTIONS.items():
+        value = os.getenv(variable)
+        if value:
+            options[option] = cast(value)
+    options.update(overrides)
+    return options
+
+
+def create_client(url: str = MONGO_URL, pool: str = "main", **overrides) -> AsyncIOMotorClient:
+    """The one place Motor clients are built, for the app and the CLI scripts alike"""
+    monitor = pool_monitors.setdefault(pool, PoolMonitor(pool))
+    return AsyncIOMotorClient(
+        url,
+        tz_aware=True,
+        event_listeners=[command_timer, query_profiler, monitor],
+        **client_options(**overrides)
+    )
+
+
+class _Handle:
+    """Forwards to a database or collection of the connected clients.
+
+    Lets modules keep `from database import db` at import time while the
+    clients themselves are only created by `connect()` at startup.
+    """
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __getitem__(self, name):
+        return self._resolve()[name]
+
+
+client = None
+sos_client = None
+_databases = {}
+
+
+def _database(name: str):
+    if name not in _databases:
+        raise RuntimeError("Database used before database.connect() was called")
+    return _databases[name]
+
+
+db = _Handle(lambda: _database("main"))
+
+users_collection = _Handle(lambda: _database("main").users)
+jobs_collection = _Handle(lambda: _database("main").jobs)
+schemes_collection = _Handle(lambda: _database("main").schemes)
+policies_collection = _Handle(lambda: _database("main").safety_policies)
+ratings_collection = _Handle(lambda: _database("main").ratings)
+
+# Same database, read from secondaries when one is fresh enough; see read_routing.py
+replica_db = _Handle(lambda: _database("replica"))
+
+sos_db = _Handle(lambda: _database("sos"))
+
+
+def connect(**overrides):
+    """Create the shared clients; a no-op if they already exist"""
+    global client, sos_client
+    if client is not None:
+        return
+    # One async client (and connection pool) shared by server.py and main.py
+    client = create_client(**overrides)
+    _databases["main"] = client[DB_NAME]
+    _databases["replica"] = client.get_database(
+        DB_NAME, read_preference=SecondaryPreferred(max_staleness=MAX_STALENESS_SECONDS)
+    )
+
+    # SOS alerts get their own small pool so bulk listing traffic cannot starve
+    # them, and a journaled majority write concern so an ack means it is durable
+    sos_client = create_client(
+        pool="sos",
+        maxPoolSize=int(os.getenv("SOS_POOL_SIZE", "10")),
+        minPoolSize=int(os.getenv("SOS_MIN_POOL_SIZE", "2"))
+    )
+    _databases["sos"] = sos_client.get_database(DB_NAME, write_concern=WriteConcern(w="majority", j=True))
+
+
+def close():
+    global client, sos_client
+    for open_client in (client, sos_client):
+        if open_client is not None:
+            open_client.close()
+    client = sos_client = None
+    _databases.clear()
+
 
-users_collection = db.users
-jobs_collection = db.jobs
-schemes_collection = db.schemes
-policies_collection = db.safety_policies
-ratings_collection = db.ratings
+@asynccontextmanager
+async def lifespan(app):
+    """FastAPI lifespan that owns the clients for the life of the app"""
+    connect()
+    try:
+        yield
+    finally:
+        close()
@@ -0,0 +1,115 @@
+"""Push channel for SOS alerts and job updates.
+
+A single MongoDB change-stream consumer feeds an in-process event bus that
+fans events out to Server-Sent Events subscribers, each filtered by topic and
+optionally by worker. Where change streams are unavailable (standalone
+mongod), write paths publish to the bus directly via `publish_local`.
+"""
+import asyncio
+import logging
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Collection -> topic name
+TOPICS = {"sos_alerts": "sos", "jobs": "jobs"}
+
+KEEPALIVE_SECONDS = 15
+
+
+class Subscription:
+    def __init__(self, topics: set, worker_id=None, maxsize: int = 100):
+        self.topics = topics
+        self.worker_id = worker_id
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def matches(self, event: dict) -> bool:
+        if event["topic"] not in self.topics:
+            return False
+        return self.worker_id is None or event["data"].get("worker_id") == self.worker_id
+
+
+class EventBus:
+    def __init__(self):
+        self._subscriptions = set()
+        self._listeners = []
+        self._consumer = None
+        # True until a change stream is confirmed to be running
+        self.local = True
+
+    def subscribe(self, topics: set, worker_id=None) -> Subscription:
+        subscription = Subscription(topics, worker_id)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    def add_listener(self, listener):
+        """Call `listener(event)` synchronously for every published event"""
+        self._listeners.append(listener)
+
+    def publish(self, topic: str, event_type: str, data: dict):
+        event = {"topic": topic, "type": event_type, "data": data}
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as exc:
+                logger.error(f"Event listener failed: {exc}", exc_info=True)
+        for subscription in list(self._subscriptions):
+            if not subscription.matches(event):
+                continue
+            if subscription.queue.full():
+                # Slow consumer: drop its oldest event rather than block publishers
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(event)
+
+    def publish_local(self, topic: str, event_type: str, data: dict):
+        """Publish from a write path; a no-op while the change stream delivers events"""
+        if self.local:
+            self.publish(topic, event_type, data)
+
+    async def _consume(self, db):
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": list(TOPICS)},
+            "operationType": {"$in": ["insert", "update", "replace"]},
+        }}]
+        try:
+            async with db.watch(pipeline, full_document="updateLookup") as stream:
+                self.local = False
+                logger.info("Event bus consuming MongoDB change stream")
+                async for change in stream:
+                    document = change.get("fullDocument")
+                    if document is None:
+                        continue
+                    document.pop("_id", None)
+                    self.publish(TOPICS[change["ns"]["coll"]], change["operationType"], document)
+        except OperationFailure as exc:
+            logger.info(f"Change streams unavailable ({exc}); using local event bus")
+        except PyMongoError as exc:
+            logger.error(f"Change stream stopped: {exc}; falling back to local event bus")
+        finally:
+            self.local = True
+
+    def start(self, db):
+        self._consumer = asyncio.create_task(self._consume(db))
+
+    def stop(self):
+        if self._consumer:
+            self._consumer.cancel()
+
+    async def stream(self, subscription: Subscription):
+        """Yield SSE frames for a subscription until the client disconnects"""
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['topic']}\ndata: {dumps(event).decode()}\n\n"
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,130 @@
+"""Geocoding of free-text locations, cached in-process and in Mongo.
+
+Request paths only consult the cache (`Geocoder.cached`), so they never wait
+on a remote service. `python geocoding.py` resolves every job, SOS alert and
+worker that has a location string but no coordinates, filling the cache as
+it goes. The remote backend is chosen with GEOCODER (`nominatim` or `none`).
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import requests
+from dotenv import load_dotenv
+
+from database import create_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_COLLECTION = "geocode_cache"
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+
+def normalize(location: str) -> str:
+    return " ".join((location or "").lower().replace(",", " , ").split())
+
+
+def point(lat: float, lng: float) -> dict:
+    """GeoJSON point; note GeoJSON orders coordinates as [lng, lat]"""
+    return {"type": "Point", "coordinates": [lng, lat]}
+
+
+def nominatim_lookup(location: str) -> Optional[dict]:
+    response = requests.get(
+        NOMINATIM_URL,
+        params={"q": location, "format": "json", "limit": 1},
+        headers={"User-Agent": os.environ.get("GEOCODER_USER_AGENT", "swayam-backend")},
+        timeout=10
+    )
+    response.raise_for_status()
+    results = response.json()
+    # Nominatim's usage policy allows at most one request per second
+    time.sleep(1)
+    if not results:
+        return None
+    return point(float(results[0]["lat"]), float(results[0]["lon"]))
+
+
+BACKENDS = {"nominatim": nominatim_lookup, "none": lambda location: None}
+
+
+class Geocoder:
+    def __init__(self, db, backend: str = "none", maxsize: int = 10000):
+        self.db = db
+        self.lookup = BACKENDS[backend]
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+
+    def _remember(self, key: str, geo):
+        self._memory[key] = geo
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    async def cached(self, location: str) -> Optional[dict]:
+        """Coordinates for a location if it was geocoded before; never calls the backend"""
+        key = normalize(location)
+        if not key:
+            return None
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        doc = await self.db[CACHE_COLLECTION].find_one({"_id": key})
+        if doc is None:
+            return None
+        self._remember(key, doc["geo"])
+        return doc["geo"]
+
+    async def resolve(self, location: str) -> Optional[dict]:
+        """Cached coordinates, falling back to the remote backend (misses are cached too)"""
+        key = normalize(location)
+        if not key:
+            return None
+        if key in self._memory:
+            return self._memory[key]
+        doc = await self.db[CACHE_COLLECTION].find_one({"_id": key})
+        if doc is None:
+            try:
+                geo = await asyncio.to_thread(self.lookup, location)
+            except requests.RequestException as exc:
+                logger.error(f"Geocoding {location!r} failed: {exc}")
+                return None
+            await self.db[CACHE_COLLECTION].update_one({"_id": key}, {"$set": {"geo": geo}}, upsert=True)
+        else:
+            geo = doc["geo"]
+        self._remember(key, geo)
+        return geo
+
+
+async def backfill(db, geocoder: Geocoder):
+    """Geocode location strings that have no coordinates yet"""
+    for collection in ("jobs", "sos_alerts", "users"):
+        resolved = 0
+        cursor = db[collection].find(
+            {"geo": None, "location": {"$type": "string"}},
+            {"_id": 1, "location": 1}
+        )
+        async for doc in cursor:
+            geo = await geocoder.resolve(doc["location"])
+            if geo:
+                await db[collection].update_one({"_id": doc["_id"]}, {"$set": {"geo": geo}})
+                resolved += 1
+        print(f"{collection}: {resolved} locations geocoded")
+
+
+async def main():
+    load_dotenv()
+    client = create_client()
+    db = client[os.environ["DB_NAME"]]
+
+    await backfill(db, Geocoder(db, backend=os.environ.get("GEOCODER", "nominatim")))
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
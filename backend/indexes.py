@@ -0,0 +1,168 @@
+"""Index declarations for every collection and a COLLSCAN guard for CI.
+
+Run `python indexes.py` to create the indexes, or `python indexes.py --check`
+to explain each endpoint query and exit non-zero if any falls back to a
+collection scan.
+"""
+import asyncio
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from database import create_client
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        # Partial: main.py registrations historically stored users without an id
+        IndexModel(
+            [("id", ASCENDING)], unique=True, name="id_unique",
+            partialFilterExpression={"id": {"$type": "string"}}
+        ),
+        IndexModel([("role", ASCENDING)], name="role"),
+        # Employer "workers with trust >= N" lookups
+        IndexModel([("role", ASCENDING), ("trust_score", DESCENDING)], name="role_trust_score"),
+        IndexModel([("geo", GEOSPHERE)], name="geo"),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        # Keyset pagination for get_jobs, with and without its filters
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="category_created_at_id"),
+        IndexModel(
+            [("status", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="status_category_created_at_id"
+        ),
+        IndexModel([("worker_id", ASCENDING)], name="worker_id"),
+        IndexModel([("employer_id", ASCENDING)], name="employer_id"),
+        # Keyword search; a collection can have only one text index
+        IndexModel(
+            [("title", TEXT), ("category", TEXT), ("description", TEXT)],
+            weights={"title": 5, "category": 3, "description": 1},
+            name="jobs_text"
+        ),
+        # Worker dashboard facet in main.py
+        IndexModel([("assigned_to", ASCENDING), ("status", ASCENDING)], name="assigned_to_status"),
+        # Nearby-job search; status rides along for the $geoNear query filter
+        IndexModel([("geo", GEOSPHERE), ("status", ASCENDING)], name="geo_status"),
+    ],
+    "safety_policies": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("worker_id", ASCENDING)], name="worker_id"),
+        # One policy per job; makes the apply_job policy upsert idempotent
+        IndexModel([("job_id", ASCENDING)], unique=True, name="job_id_unique"),
+    ],
+    "sos_alerts": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("worker_id", ASCENDING)], name="worker_id"),
+        IndexModel([("geo", GEOSPHERE)], name="geo"),
+    ],
+    "ratings": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("ratee_id", ASCENDING)], name="ratee_id"),
+        IndexModel([("job_id", ASCENDING), ("rater_id", ASCENDING)], name="job_id_rater_id"),
+    ],
+    "schemes": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("category", ASCENDING)], name="category"),
+        IndexModel([("state", ASCENDING)], name="state"),
+    ],
+    "daily_rollups": [
+        IndexModel([("scope", ASCENDING), ("key", ASCENDING), ("day", ASCENDING)], name="scope_key_day"),
+    ],
+}
+
+# Representative query of each endpoint: (endpoint, collection, filter, sort)
+ENDPOINT_QUERIES = [
+    ("register/login", "users", {"email": "x"}, None),
+    ("get_current_user_info", "users", {"id": "x"}, None),
+    ("get_jobs", "jobs", {}, [("created_at", -1), ("id", -1)]),
+    ("get_jobs?status", "jobs", {"status": "open"}, [("created_at", -1), ("id", -1)]),
+    ("get_jobs?category", "jobs", {"category": "x"}, [("created_at", -1), ("id", -1)]),
+    ("get_jobs?status&category", "jobs", {"status": "open", "category": "x"}, [("created_at", -1), ("id", -1)]),
+    ("get_job", "jobs", {"id": "x"}, None),
+    ("get_worker_jobs", "jobs", {"worker_id": "x"}, None),
+    ("get_employer_jobs", "jobs", {"employer_id": "x"}, None),
+    ("get_worker_dashboard", "jobs", {"assigned_to": "x"}, None),
+    ("get_workers", "users", {"role": "worker"}, None),
+    ("get_worker", "users", {"id": "x", "role": "worker"}, None),
+    ("get_trusted_workers", "users", {"role": "worker", "trust_score": {"$gte": 0}}, [("trust_score", -1)]),
+    ("get_worker_policies", "safety_policies", {"worker_id": "x"}, None),
+    ("get_policy", "safety_policies", {"id": "x"}, None),
+    ("get_worker_alerts", "sos_alerts", {"worker_id": "x"}, None),
+    ("get_user_ratings", "ratings", {"ratee_id": "x"}, None),
+    ("check_job_rated", "ratings", {"job_id": "x", "rater_id": "x"}, None),
+    ("get_schemes?category", "schemes", {"category": "x"}, None),
+    ("get_schemes?state", "schemes", {"state": "x"}, None),
+    ("get_scheme", "schemes", {"id": "x"}, None),
+    ("get_weekly_jobs", "daily_rollups", {"scope": "worker", "key": "x", "jobs_completed": {"$gt": 0}}, None),
+    ("get_daily_stats", "daily_rollups", {"scope": "platform", "key": None, "day": {"$gte": "x"}}, [("day", 1)]),
+]
+
+
+async def ensure_indexes(db):
+    """Create every declared index; existing indexes are left untouched.
+
+    Indexes are created one at a time so one that cannot be built does not
+    take the rest of its collection down with it.
+    """
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            try:
+                await db[collection].create_indexes([index])
+            except OperationFailure as exc:
+                # e.g. duplicate emails already stored block the unique index
+                logger.error(f"Could not create index {index.document['name']} on {collection}: {exc}")
+
+
+def _plan_stages(plan: dict):
+    """Yield every stage name of a query plan tree"""
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def find_collscans(db) -> list:
+    """Return the endpoints whose winning plan contains a COLLSCAN"""
+    offenders = []
+    for endpoint, collection, query, sort in ENDPOINT_QUERIES:
+        find = {"find": collection, "filter": query}
+        if sort:
+            find["sort"] = dict(sort)
+        explain = await db.command({"explain": find, "verbosity": "queryPlanner"})
+        if "COLLSCAN" in _plan_stages(explain["queryPlanner"]["winningPlan"]):
+            offenders.append(endpoint)
+    return offenders
+
+
+async def main(check: bool) -> int:
+    load_dotenv()
+    client = create_client()
+    db = client[os.environ["DB_NAME"]]
+
+    await ensure_indexes(db)
+    print("Indexes ensured")
+
+    status = 0
+    if check:
+        offenders = await find_collscans(db)
+        for endpoint in offenders:
+            print(f"COLLSCAN: {endpoint}")
+        status = 1 if offenders else 0
+
+    client.close()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(check="--check" in sys.argv)))
@@ -0,0 +1,131 @@
+"""In-memory matching of open jobs to worker skills and location.
+
+Open jobs are kept in two inverted indexes: skill term -> jobs whose category
+carries that term, and normalized location part -> jobs at that place. Each
+posting list is an insertion-ordered dict of job id -> created timestamp, so
+iterating it in reverse yields newest jobs first and lets a query stop as soon
+as it has enough matches. The index is loaded once at startup and then kept
+current from the event bus (see `events.EventBus.add_listener`).
+"""
+import heapq
+import re
+from datetime import datetime
+
+# Words that carry no matching signal in skill names, e.g. "Beauty Services"
+GENERIC_TERMS = {"service", "services", "work", "worker", "job", "jobs"}
+
+
+def skill_terms(text: str) -> set:
+    return {t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in GENERIC_TERMS}
+
+
+def location_parts(text: str) -> list:
+    """'Koramangala, Bangalore' -> ['koramangala', 'bangalore'], most specific first"""
+    parts = [" ".join(re.findall(r"[a-z0-9]+", part.lower())) for part in (text or "").split(",")]
+    return [p for p in parts if p]
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp() if isinstance(value, datetime) else 0.0
+
+
+class JobMatcher:
+    def __init__(self):
+        self._jobs = {}
+        self._by_term = {}
+        self._by_location = {}
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def add(self, job: dict):
+        job_id = job["id"]
+        self.remove(job_id)
+        created = _timestamp(job.get("created_at"))
+        terms = skill_terms(job.get("category"))
+        places = set(location_parts(job.get("location")))
+        self._jobs[job_id] = (terms, places)
+        for term in terms:
+            self._by_term.setdefault(term, {})[job_id] = created
+        for place in places:
+            self._by_location.setdefault(place, {})[job_id] = created
+
+    def remove(self, job_id: str):
+        entry = self._jobs.pop(job_id, None)
+        if entry is None:
+            return
+        terms, places = entry
+        for index, keys in ((self._by_term, terms), (self._by_location, places)):
+            for key in keys:
+                postings = index.get(key)
+                if postings is not None:
+                    postings.pop(job_id, None)
+                    if not postings:
+                        del index[key]
+
+    def on_event(self, event: dict):
+        """Event bus listener: index newly open jobs, drop jobs that left 'open'"""
+        if event["topic"] != "jobs":
+            return
+        job = event["data"]
+        if job.get("status", "open") == "open" and "category" in job:
+            self.add(job)
+        else:
+            self.remove(job["id"])
+
+    async def load(self, jobs_collection):
+        """Index every open job, oldest first so postings stay in recency order"""
+        self._jobs, self._by_term, self._by_location = {}, {}, {}
+        cursor = jobs_collection.find(
+            {"status": "open"},
+            {"_id": 0, "id": 1, "category": 1, "location": 1, "created_at": 1}
+        ).sort("created_at", 1)
+        async for job in cursor:
+            self.add(job)
+
+    @staticmethod
+    def _newest_first(postings: list):
+        """Lazily merge posting lists newest first, without duplicates"""
+        seen = set()
+        merged = heapq.merge(*(reversed(p.items()) for p in postings), key=lambda item: item[1], reverse=True)
+        for job_id, _ in merged:
+            if job_id not in seen:
+                seen.add(job_id)
+                yield job_id
+
+    def recommend(self, skills: list, location: str = None, limit: int = 20) -> list:
+        """Job ids ranked by location specificity, then skill match, then recency"""
+        terms = set()
+        for skill in skills or []:
+            terms |= skill_terms(skill)
+        skill_postings = [self._by_term[t] for t in terms if t in self._by_term]
+
+        results = []
+        chosen = set()
+
+        def take(job_ids):
+            for job_id in job_ids:
+                if len(results) >= limit:
+                    return
+                if job_id not in chosen:
+                    chosen.add(job_id)
+                    results.append(job_id)
+
+        # Skill matches at each of the worker's places, most specific place first
+        for place in location_parts(location):
+            postings = self._by_location.get(place)
+            if not postings or len(results) >= limit:
+                continue
+            if not skill_postings:
+                take(job_id for job_id, _ in reversed(postings.items()))
+            elif len(postings) <= sum(len(p) for p in skill_postings):
+                # Drive the scan from the smaller side, probe the other
+                take(j for j, _ in reversed(postings.items()) if self._jobs[j][0] & terms)
+            else:
+                take(j for j in self._newest_first(skill_postings) if place in self._jobs[j][1])
+
+        # Then skill matches anywhere
+        take(self._newest_first(skill_postings))
+        return results
@@ -1,26 +1,36 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
 from typing import Optional, List, Dict
-from datetime import datetime, timedelta
-from passlib.context import CryptContext
+from datetime import datetime, timedelta, timezone
+import os
+import uuid
 from jose import jwt
-from database import users_collection, jobs_collection
+from auth import get_current_employer, get_current_user, password_hasher
+from database import db, lifespan, users_collection, jobs_collection
+from rollups import weekday_totals
+from stats import TTLCache
+from trust_score import DEFAULT_METRICS, DEFAULT_TRUST_SCORE, backfill_trust_scores, compute_trust_score
 
-app = FastAPI()
+@asynccontextmanager
+async def standalone_lifespan(app: FastAPI):
+    async with lifespan(app):
+        # Users stored before trust_score was materialized would miss its indexed predicates
+        await backfill_trust_scores(users_collection, only_missing=True)
+        yield
+
+# Standalone app; server.py mounts worker_router under its own lifespan
+app = FastAPI(lifespan=standalone_lifespan)
+
+# Onboarding, trust-score and dashboard endpoints, also mounted by server.py
+worker_router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 
 SECRET_KEY = "SWAYAM_SUPER_SECRET_KEY"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def hash_password(password: str):
-    return pwd_context.hash(password)
-
-def verify_password(p, hp):
-    return pwd_context.verify(p, hp)
-
 def create_access_token(data: dict, expires_delta: timedelta):
     to_encode = data.copy()
     expire = datetime.utcnow() + expires_delta
@@ -70,21 +80,22 @@ class SOSRequest(BaseModel):
 
 # ---------------- ROOT ----------------
 @app.get("/")
-def root():
+async def root():
     return {"message": "SWAYAM Backend Running Successfully"}
 
 # ---------------- AUTH ----------------
 @app.post("/api/auth/register")
-def register(user: RegisterRequest):
-    if users_collection.find_one({"email": user.email}):
+async def register(user: RegisterRequest):
+    if await users_collection.find_one({"email": user.email}, {"_id": 1}):
         raise HTTPException(status_code=400, detail="User already exists")
 
-    users_collection.insert_one({
+    await users_collection.insert_one({
+        "id": str(uuid.uuid4()),
         "name": user.name,
         "email": user.email,
         "phone": user.phone,
         "role": user.role,
-        "password": hash_password(user.password),
+        "password": await password_hasher.hash(user.password),
         "onboarding_step": 1,
         "is_verified": False,
         "work_mode": None,
@@ -93,20 +104,17 @@ def register(user: RegisterRequest):
             "id_verified": False,
             "safety_agreement": False,
         },
-        "trust_metrics": {
-            "completed_jobs": 0,
-            "safety_score": 100,
-            "rating": 5.0,
-        },
-        "created_at": datetime.now().isoformat(),
+        "trust_metrics": dict(DEFAULT_METRICS),
+        "trust_score": DEFAULT_TRUST_SCORE,
+        "created_at": datetime.now(timezone.utc),
     })
 
     return {"message": "User registered successfully"}
 
 @app.post("/api/auth/login")
-def login(data: LoginRequest):
-    user = users_collection.find_one({"email": data.email})
-    if not user or not verify_password(data.password, user["password"]):
+async def login(data: LoginRequest):
+    user = await users_collection.find_one({"email": data.email})
+    if not user or not await password_hasher.verify(data.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_access_token(
@@ -124,136 +132,169 @@ def login(data: LoginRequest):
     }
 
 # ---------------- ONBOARDING ----------------
-@app.get("/api/onboarding/status")
-def onboarding_status(email: str):
-    user = users_collection.find_one(
+def require_self_or_admin(current_user: dict, email: str):
+    """By-email worker routes are limited to that user and admins"""
+    if current_user["role"] != "admin" and current_user.get("email") != email:
+        raise HTTPException(status_code=403, detail="Not allowed to view another user's data")
+
+@worker_router.get("/onboarding/status")
+async def onboarding_status(email: str, current_user: dict = Depends(get_current_user)):
+    require_self_or_admin(current_user, email)
+    user = await users_collection.find_one(
         {"email": email},
         {"_id": 0,"onboarding_step": 1,"work_mode": 1,"verifications": 1,"is_verified": 1}
     )
-    if not user:
+    # A user who has not started onboarding projects to an empty dict
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 # ---------------- TRUST SCORE ----------------
-@app.get("/api/trust-score/{worker_email}")
-def get_trust_score(worker_email: str):
+TRUST_PROJECTION = {"_id": 0, "trust_score": 1, "trust_metrics": 1}
+
+def stored_trust_score(user: dict) -> int:
+    if "trust_score" in user:
+        return user["trust_score"]
+    # Not backfilled yet
+    return compute_trust_score(user.get("trust_metrics"))
 
-    user = users_collection.find_one({"email": worker_email})
+@worker_router.get("/trust-score/{worker_email}")
+async def get_trust_score(worker_email: str, current_user: dict = Depends(get_current_user)):
+    require_self_or_admin(current_user, worker_email)
+
+    user = await users_collection.find_one({"email": worker_email}, TRUST_PROJECTION)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    metrics = user.get("trust_metrics", {})
-    completed = metrics.get("completed_jobs", 0)
-    rating = metrics.get("rating", 5.0)
-    safety_score = metrics.get("safety_score", 100)
-
-    trust_score = min(
-        100,
-        int(40 + completed*5 + rating*5 + safety_score*0.2)
-    )
+    return {"trust_score": stored_trust_score(user)}
 
-    return {"trust_score": trust_score}
+@worker_router.get("/trust-score")
+async def get_trusted_workers(
+    min_score: int = 0,
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: dict = Depends(get_current_employer)
+):
+    """Workers with trust score >= min_score, highest first"""
+    return await users_collection.find(
+        {"role": "worker", "trust_score": {"$gte": min_score}},
+        {"_id": 0, "id": 1, "name": 1, "skills": 1, "trust_score": 1}
+    ).sort("trust_score", -1).limit(limit).to_list(None)
 
 # ---------------- JOBS ----------------
 @app.get("/api/jobs")
-def get_jobs(status: Optional[str] = None):
+async def get_jobs(status: Optional[str] = None):
     query = {"status": status} if status else {}
-    return list(jobs_collection.find(query, {"_id": 0}))
+    return await jobs_collection.find(query, {"_id": 0}).to_list(None)
 
 @app.get("/api/jobs/{job_id}")
-def get_single_job(job_id: str):
-    job = jobs_collection.find_one({"id": job_id}, {"_id": 0})
+async def get_single_job(job_id: str):
+    job = await jobs_collection.find_one({"id": job_id}, {"_id": 0})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
 # ---------------- APPLY JOB WITH TRUST CHECK ----------------
 @app.post("/api/jobs/{job_id}/apply")
-def apply_job(job_id: str, data: ApplyJobRequest):
+async def apply_job(job_id: str, data: ApplyJobRequest):
 
-    job = jobs_collection.find_one({"id": job_id})
+    job = await jobs_collection.find_one({"id": job_id}, {"_id": 0, "status": 1, "min_trust_score": 1})
     if not job or job.get("status") != "open":
         raise HTTPException(status_code=400, detail="Job unavailable")
 
-    user = users_collection.find_one({"email": data.worker_email})
-    if not user:
-        raise HTTPException(status_code=404, detail="Worker not found")
-
-    metrics = user.get("trust_metrics", {})
-    completed = metrics.get("completed_jobs", 0)
-    rating = metrics.get("rating", 5.0)
-    safety_score = metrics.get("safety_score", 100)
-
-    trust_score = min(
-        100,
-        int(40 + completed*5 + rating*5 + safety_score*0.2)
-    )
-
     required = job.get("min_trust_score", 40)
 
-    if trust_score < required:
-        raise HTTPException(
-            status_code=403,
-            detail=f"Trust Score {trust_score} required {required}"
-        )
-
-    jobs_collection.update_one(
-        {"id": job_id},
+    # Eligibility is one indexed predicate on the materialized score
+    eligible = await users_collection.find_one(
+        {"email": data.worker_email, "trust_score": {"$gte": required}},
+        {"_id": 0, "id": 1}
+    )
+    if not eligible:
+        # The predicate also misses users whose score is not backfilled yet
+        user = await users_collection.find_one({"email": data.worker_email}, {**TRUST_PROJECTION, "id": 1})
+        if not user:
+            raise HTTPException(status_code=404, detail="Worker not found")
+        if stored_trust_score(user) < required:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Trust Score {stored_trust_score(user)} required {required}"
+            )
+        eligible = user
+
+    # Same assignment fields as server.py's apply route, claimed only while still open
+    claimed = await jobs_collection.update_one(
+        {"id": job_id, "status": "open"},
         {"$set": {
             "status": "assigned",
+            "worker_id": eligible.get("id"),
+            "worker_name": data.worker_name,
             "assigned_to": data.worker_email,
-            "assigned_at": datetime.now().isoformat(),
+            "assigned_at": datetime.now(timezone.utc),
         }},
     )
+    if not claimed.modified_count:
+        raise HTTPException(status_code=400, detail="Job unavailable")
+    dashboard_cache.invalidate(data.worker_email)
 
     return {"message": "Job accepted successfully"}
 
 # ---------------- SOS ----------------
 @app.post("/api/sos/trigger")
-def trigger_sos(data: SOSRequest):
+async def trigger_sos(data: SOSRequest):
     return {"message": "SOS triggered successfully"}
 
 # ---------------- DASHBOARD ----------------
-@app.get("/api/dashboard/{worker_email}")
-def get_worker_dashboard(worker_email: str):
+# ISO weekday -> label, in display order
+WEEK_DAYS = {7:"Sun",1:"Mon",2:"Tue",3:"Wed",4:"Thu",5:"Fri",6:"Sat"}
 
-    total_jobs = jobs_collection.count_documents({"assigned_to": worker_email})
-    completed_jobs = jobs_collection.count_documents({"assigned_to": worker_email,"status": "completed"})
-    in_progress = jobs_collection.count_documents({"assigned_to": worker_email,"status": {"$in": ["assigned","in_progress"]}})
+# Per-worker dashboard cache; dropped whenever one of the worker's jobs changes state
+dashboard_cache = TTLCache(ttl=float(os.getenv("WORKER_DASHBOARD_CACHE_TTL", "30")), maxsize=10000)
 
-    earnings_pipeline = [
-        {"$match":{"assigned_to": worker_email,"status": "completed"}},
-        {"$group":{"_id": None,"total": {"$sum": "$payment"}}}
+async def compute_worker_summary(worker_email: str) -> dict:
+    """Totals and earnings from the worker's jobs, weekday histogram from the daily rollups"""
+    completed = {"$eq": ["$status", "completed"]}
+    pipeline = [
+        {"$match": {"assigned_to": worker_email}},
+        {"$group": {
+            "_id": None,
+            "total_jobs": {"$sum": 1},
+            "completed_jobs": {"$sum": {"$cond": [completed, 1, 0]}},
+            "in_progress": {"$sum": {"$cond": [{"$in": ["$status", ["assigned", "in_progress"]]}, 1, 0]}},
+            "earnings": {"$sum": {"$cond": [completed, "$payment", 0]}},
+        }}
     ]
-    earnings_data = list(jobs_collection.aggregate(earnings_pipeline))
-    total_earnings = earnings_data[0]["total"] if earnings_data else 0
+    rows = await jobs_collection.aggregate(pipeline).to_list(1)
+    totals = rows[0] if rows else {}
 
+    # Completions are counted per worker id on the day they happen
+    worker = await users_collection.find_one({"email": worker_email}, {"_id": 0, "id": 1})
+    weekly = await weekday_totals(db, "jobs_completed", "worker", worker["id"]) if worker else {}
     return {
-        "total_jobs": total_jobs,
-        "completed_jobs": completed_jobs,
-        "in_progress": in_progress,
-        "earnings": total_earnings
+        "total_jobs": totals.get("total_jobs", 0),
+        "completed_jobs": totals.get("completed_jobs", 0),
+        "in_progress": totals.get("in_progress", 0),
+        "earnings": totals.get("earnings", 0),
+        "weekly": [{"day": name, "jobs": weekly.get(weekday, 0)} for weekday, name in WEEK_DAYS.items()],
     }
 
-# ---------------- WEEKLY JOB ANALYTICS ----------------
-@app.get("/api/weekly-jobs/{worker_email}")
-def get_weekly_jobs(worker_email: str):
+async def worker_summary(worker_email: str) -> dict:
+    return await dashboard_cache.get_or_compute(worker_email, lambda: compute_worker_summary(worker_email))
 
-    pipeline = [
-        {"$match":{"assigned_to": worker_email,"status": "completed"}},
-        {"$group":{
-            "_id":{"$dayOfWeek":{"$toDate": "$assigned_at"}},
-            "count":{"$sum": 1}
-        }}
-    ]
-
-    raw_data = list(jobs_collection.aggregate(pipeline))
-
-    week_map = {1:"Sun",2:"Mon",3:"Tue",4:"Wed",5:"Thu",6:"Fri",7:"Sat"}
-    formatted=[]
+@worker_router.get("/dashboard/{worker_email}")
+async def get_worker_dashboard(worker_email: str, current_user: dict = Depends(get_current_user)):
+    require_self_or_admin(current_user, worker_email)
+    summary = await worker_summary(worker_email)
+    return {
+        "total_jobs": summary["total_jobs"],
+        "completed_jobs": summary["completed_jobs"],
+        "in_progress": summary["in_progress"],
+        "earnings": summary["earnings"]
+    }
 
-    for i in range(1,8):
-        day=next((x for x in raw_data if x["_id"]==i),None)
-        formatted.append({"day":week_map[i],"jobs":day["count"] if day else 0})
+# ---------------- WEEKLY JOB ANALYTICS ----------------
+@worker_router.get("/weekly-jobs/{worker_email}")
+async def get_weekly_jobs(worker_email: str, current_user: dict = Depends(get_current_user)):
+    require_self_or_admin(current_user, worker_email)
+    summary = await worker_summary(worker_email)
+    return summary["weekly"]
 
-    return formatted
+app.include_router(worker_router)
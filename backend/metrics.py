@@ -0,0 +1,280 @@
+"""Prometheus metrics for the API, MongoDB commands and auth hot paths.
+
+`MetricsMiddleware` records per-route latency, request counts and in-flight
+requests; `CommandTimer` is a pymongo command listener registered on the
+shared Motor clients that times every command by collection and operation,
+and `PoolMonitor` tracks each client's connection pool saturation.
+Everything lands in the default registry, exposed by server.py at /metrics.
+
+`python metrics.py` measures the middleware's per-request overhead against a
+bare ASGI app.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route"]
+)
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency", ["collection", "command"],
+    buckets=FAST_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands", ["collection", "command"]
+)
+
+PASSWORD_HASH_LATENCY = Histogram(
+    "password_hash_duration_seconds", "bcrypt time on the hashing pool", ["operation"]
+)
+POOL_MAX_SIZE = Gauge("mongodb_pool_max_size", "Configured maxPoolSize", ["pool", "address"])
+POOL_CONNECTIONS = Gauge("mongodb_pool_connections", "Open pooled connections", ["pool", "address"])
+POOL_CHECKED_OUT = Gauge("mongodb_pool_checked_out", "Connections in use", ["pool", "address"])
+POOL_WAITING = Gauge("mongodb_pool_waiting", "Operations waiting for a connection", ["pool", "address"])
+POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ["pool"],
+    buckets=FAST_BUCKETS
+)
+POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total", "Failed connection check-outs", ["pool", "reason"]
+)
+
+JWT_DECODE_LATENCY = Histogram(
+    "jwt_decode_duration_seconds", "JWT signature check and decode time", buckets=FAST_BUCKETS
+)
+
+# Requests that match no route share one label so scanners cannot blow up cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+
+def render() -> tuple:
+    """(body, content type) for a Prometheus scrape"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; labels requests by route template, not raw path"""
+
+    def __init__(self, app):
+        self.app = app
+        # Label children by key; .labels() is the costly part of an observation
+        self._latency = {}
+        self._requests = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            # The router stores the matched route on the shared scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            key = (scope["method"], route)
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = REQUEST_LATENCY.labels(*key)
+            histogram.observe(elapsed)
+            key = (scope["method"], route, status_code)
+            counter = self._requests.get(key)
+            if counter is None:
+                counter = self._requests[key] = REQUESTS.labels(scope["method"], route, str(status_code))
+            counter.inc()
+
+
+class CommandTimer(monitoring.CommandListener):
+    """Times MongoDB commands by collection and command name"""
+
+    def __init__(self):
+        # (connection, request id) -> labels, set when the command starts
+        self._started = {}
+
+    @staticmethod
+    def _collection(event) -> str:
+        if event.command_name == "getMore":
+            return event.command.get("collection", "")
+        target = event.command.get(event.command_name)
+        return target if isinstance(target, str) else ""
+
+    def started(self, event):
+        self._started[(event.connection_id, event.request_id)] = (self._collection(event), event.command_name)
+
+    def succeeded(self, event):
+        labels = self._started.pop((event.connection_id, event.request_id), None)
+        if labels:
+            MONGO_COMMAND_LATENCY.labels(*labels).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        labels = self._started.pop((event.connection_id, event.request_id), None)
+        if labels:
+            MONGO_COMMAND_LATENCY.labels(*labels).observe(event.duration_micros / 1e6)
+            MONGO_COMMAND_FAILURES.labels(*labels).inc()
+
+
+command_timer = CommandTimer()
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool saturation for one client, labelled with its pool name"""
+
+    def __init__(self, pool: str):
+        self.pool = pool
+        self._lock = threading.Lock()
+        # Check-out happens on the thread running the operation
+        self._local = threading.local()
+        self._max_size = {}
+        self._checked_out = {}
+        self._peak_checked_out = 0
+        self._waiting = 0
+        self._peak_waiting = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._failures = {}
+
+    def _adjust(self, gauge: Gauge, address, delta: int):
+        gauge.labels(self.pool, "%s:%s" % address).inc(delta)
+
+    def pool_created(self, event):
+        max_size = event.options.get("maxPoolSize", 100)
+        self._max_size[event.address] = max_size
+        POOL_MAX_SIZE.labels(self.pool, "%s:%s" % event.address).set(max_size)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._adjust(POOL_CONNECTIONS, event.address, 1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._adjust(POOL_CONNECTIONS, event.address, -1)
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+        self._adjust(POOL_WAITING, event.address, 1)
+        with self._lock:
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+
+    def _check_out_finished(self, address) -> float:
+        waited = time.perf_counter() - getattr(self._local, "started", time.perf_counter())
+        self._adjust(POOL_WAITING, address, -1)
+        with self._lock:
+            self._waiting -= 1
+        return waited
+
+    def connection_check_out_failed(self, event):
+        self._check_out_finished(event.address)
+        POOL_CHECKOUT_FAILURES.labels(self.pool, event.reason).inc()
+        with self._lock:
+            self._failures[event.reason] = self._failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        waited = self._check_out_finished(event.address)
+        POOL_CHECKOUT_WAIT.labels(self.pool).observe(waited)
+        self._adjust(POOL_CHECKED_OUT, event.address, 1)
+        with self._lock:
+            self._waits += 1
+            self._wait_seconds += waited
+            self._checked_out[event.address] = self._checked_out.get(event.address, 0) + 1
+            self._peak_checked_out = max(self._peak_checked_out, self._checked_out[event.address])
+
+    def connection_checked_in(self, event):
+        self._adjust(POOL_CHECKED_OUT, event.address, -1)
+        with self._lock:
+            self._checked_out[event.address] = self._checked_out.get(event.address, 1) - 1
+
+    def reset_peaks(self):
+        with self._lock:
+            self._peak_checked_out = sum(self._checked_out.values())
+            self._peak_waiting = self._waiting
+            self._waits = 0
+            self._wait_seconds = 0.0
+            self._failures = {}
+
+    def stats(self) -> dict:
+        """Saturation counters since start (or the last reset) for monitoring and benchmarks"""
+        with self._lock:
+            return {
+                "pool": self.pool,
+                "max_pool_size": max(self._max_size.values(), default=None),
+                "checked_out": sum(self._checked_out.values()),
+                "peak_checked_out": self._peak_checked_out,
+                "waiting": self._waiting,
+                "peak_waiting": self._peak_waiting,
+                "mean_checkout_wait_ms": round(self._wait_seconds / self._waits * 1000, 3) if self._waits else None,
+                "checkout_failures": dict(self._failures),
+            }
+
+
+async def measure_overhead(requests: int) -> dict:
+    """Mean per-request cost of MetricsMiddleware around a no-op ASGI app"""
+
+    class Route:
+        path = "/api/jobs/{job_id}"
+
+    async def endpoint(scope, receive, send):
+        scope["route"] = Route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    async def run(app) -> float:
+        started = time.perf_counter()
+        for _ in range(requests):
+            await app({"type": "http", "method": "GET", "path": "/api/jobs/1"}, receive, send)
+        return (time.perf_counter() - started) / requests
+
+    wrapped = MetricsMiddleware(endpoint)
+    await run(wrapped)  # warm the label cache
+    bare = await run(endpoint)
+    instrumented = await run(wrapped)
+    return {
+        "requests": requests,
+        "bare_us": round(bare * 1e6, 2),
+        "instrumented_us": round(instrumented * 1e6, 2),
+        "overhead_us": round((instrumented - bare) * 1e6, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure MetricsMiddleware overhead per request")
+    parser.add_argument("--requests", type=int, default=100000)
+    print(asyncio.run(measure_overhead(parser.parse_args().requests)))
@@ -0,0 +1,66 @@
+"""One-time migration of ISO-string timestamps to native BSON dates.
+
+Older rows stored `created_at`/`activated_at` via `.isoformat()`. Native dates
+sort correctly, are index-friendly and need no parsing on read.
+
+    python migrate_dates.py
+"""
+import asyncio
+import os
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+from database import create_client
+
+DATE_FIELDS = {
+    "users": ["created_at"],
+    "jobs": ["created_at", "assigned_at"],
+    "safety_policies": ["activated_at"],
+    "sos_alerts": ["created_at"],
+    "ratings": ["created_at"],
+    "schemes": ["created_at"],
+}
+
+BATCH_SIZE = 1000
+
+
+def parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    # Naive timestamps were written with datetime.now(); treat them as UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+async def migrate_field(collection, field: str) -> int:
+    migrated = 0
+    batch = []
+    async for doc in collection.find({field: {"$type": "string"}}, {"_id": 1, field: 1}):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {field: parse_date(doc[field])}}))
+        if len(batch) == BATCH_SIZE:
+            await collection.bulk_write(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+    if batch:
+        await collection.bulk_write(batch, ordered=False)
+        migrated += len(batch)
+    return migrated
+
+
+async def migrate_dates():
+    load_dotenv()
+    client = create_client()
+    db = client[os.environ["DB_NAME"]]
+
+    for collection, fields in DATE_FIELDS.items():
+        for field in fields:
+            migrated = await migrate_field(db[collection], field)
+            print(f"{collection}.{field}: {migrated} documents migrated")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_dates())
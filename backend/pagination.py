@@ -0,0 +1,78 @@
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Keyset order shared by every paginated listing: newest first, id breaks ties
+KEYSET_SORT = [("created_at", -1), ("id", -1)]
+
+
+def encode_token(payload: dict) -> str:
+    """Encode a sort-key payload as an opaque, URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> dict:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict):
+            raise ValueError(payload)
+        return payload
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def encode_cursor(created_at, doc_id: str) -> str:
+    """Encode the sort key of the last returned document as an opaque token"""
+    if hasattr(created_at, "isoformat"):
+        created_at = created_at.isoformat()
+    return encode_token({"c": created_at, "i": doc_id})
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    """Decode a cursor token back into its (created_at, id) sort key"""
+    payload = decode_token(token)
+    try:
+        return datetime.fromisoformat(payload["c"]), payload["i"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def decode_distance_cursor(token: str) -> Tuple[float, str]:
+    """Decode a nearby-jobs cursor back into its (distance in metres, id) sort key"""
+    payload = decode_token(token)
+    distance, doc_id = payload.get("d"), payload.get("i")
+    if isinstance(distance, bool) or not isinstance(distance, (int, float)) \
+            or not math.isfinite(distance) or distance < 0 or not isinstance(doc_id, str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    return distance, doc_id
+
+
+def keyset_query(query: dict, cursor: Optional[str]) -> dict:
+    """Restrict a filter to the documents strictly after the given cursor"""
+    if not cursor:
+        return query
+
+    created_at, doc_id = decode_cursor(cursor)
+    after = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": doc_id}},
+    ]}
+    return {"$and": [query, after]} if query else after
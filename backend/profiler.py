@@ -0,0 +1,272 @@
+"""Opt-in query profiler that ranks MongoDB query shapes by time spent.
+
+`QueryProfiler` is a pymongo command listener on the shared Motor clients.
+With QUERY_PROFILER=1 it samples commands (QUERY_PROFILER_SAMPLE_RATE,
+default 1.0), reduces each to a shape -- operation, collection and the
+filter/sort/pipeline with every literal replaced by "?" -- and aggregates
+count, total and max time and documents returned per shape. The ranked
+report is served at GET /api/admin/query-profile.
+
+`python profiler.py` builds the same report from MongoDB's own profiler
+(system.profile), which also records documents examined:
+
+    python profiler.py --enable --slowms 20   # turn on the database profiler
+    python profiler.py --limit 20             # ranked shapes from system.profile
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+
+from dotenv import load_dotenv
+from pymongo import monitoring
+
+# Bound memory when queries are built with unexpected key sets
+MAX_SHAPES = 1000
+
+# Commands that never touch documents
+IGNORED_COMMANDS = {"hello", "isMaster", "ismaster", "ping", "buildInfo", "endSessions", "saslStart", "saslContinue"}
+
+
+def normalize(value):
+    """Replace literals with "?", keeping field names, operators and structure"""
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, dict) for item in value):
+            return [normalize(item) for item in value]
+        # $in lists, coordinates and other literal arrays collapse regardless of length
+        return "?"
+    return "?"
+
+
+def _sort_shape(sort):
+    return dict(sort) if sort else None
+
+
+def command_shape(command_name: str, command: dict) -> dict:
+    """The parts of a command that identify its query shape"""
+    if command_name == "find":
+        return {"filter": normalize(command.get("filter", {})), "sort": _sort_shape(command.get("sort"))}
+    if command_name == "aggregate":
+        return {"pipeline": normalize(command.get("pipeline", []))}
+    if command_name in ("count", "distinct"):
+        return {"query": normalize(command.get("query", {})), "key": command.get("key")}
+    if command_name == "findAndModify":
+        return {
+            "query": normalize(command.get("query", {})),
+            "sort": _sort_shape(command.get("sort")),
+            "update": normalize(command.get("update")),
+        }
+    if command_name == "update":
+        return {"updates": [{"q": normalize(u.get("q", {})), "u": normalize(u.get("u"))} for u in command.get("updates", [])[:1]]}
+    if command_name == "delete":
+        return {"deletes": [normalize(d.get("q", {})) for d in command.get("deletes", [])[:1]]}
+    # insert and anything else: the operation and collection are the shape
+    return {}
+
+
+def _collection(command_name: str, command: dict) -> str:
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+def _documents(reply: dict) -> int:
+    """Documents returned (reads) or affected (writes) according to a reply"""
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if "value" in reply:
+        return 1 if reply["value"] else 0
+    return reply.get("n", 0)
+
+
+class QueryProfiler(monitoring.CommandListener):
+    @classmethod
+    def from_env(cls) -> "QueryProfiler":
+        return cls(
+            enabled=os.environ.get("QUERY_PROFILER", "0") == "1",
+            sample_rate=float(os.environ.get("QUERY_PROFILER_SAMPLE_RATE", "1.0"))
+        )
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 1.0):
+        # report() scales the sampled totals up by 1 / sample_rate
+        if not 0 < sample_rate <= 1:
+            raise ValueError(
+                f"Query profiler sample_rate (QUERY_PROFILER_SAMPLE_RATE) must be in (0, 1], got {sample_rate}"
+            )
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._shapes = {}
+        # Commands in flight, and open cursors mapped to the shape that opened them
+        self._started = {}
+        self._cursors = {}
+        self.dropped = 0
+
+    def started(self, event):
+        if not self.enabled or event.command_name in IGNORED_COMMANDS:
+            return
+        cursor_id = None
+        if event.command_name == "getMore":
+            cursor_id = event.command.get("getMore")
+            key = self._cursors.get(cursor_id)
+        else:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return
+            command = event.command
+            collection = _collection(event.command_name, command)
+            shape = command_shape(event.command_name, command)
+            key = json.dumps([event.command_name, collection, shape], sort_keys=True, default=str)
+        if key is not None:
+            self._started[(event.connection_id, event.request_id)] = (key, cursor_id)
+
+    def _record(self, event, failed: bool):
+        started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        key, cursor_id = started
+        reply = getattr(event, "reply", None) or {}
+        millis = event.duration_micros / 1000
+        with self._lock:
+            entry = self._shapes.get(key)
+            if entry is None:
+                if len(self._shapes) >= MAX_SHAPES:
+                    self.dropped += 1
+                    return
+                command_name, collection, shape = json.loads(key)
+                entry = self._shapes[key] = {
+                    "command": command_name,
+                    "collection": collection,
+                    "shape": shape,
+                    "count": 0,
+                    "failures": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "documents": 0,
+                }
+            if event.command_name != "getMore":
+                entry["count"] += 1
+            entry["failures"] += failed
+            entry["total_ms"] += millis
+            entry["max_ms"] = max(entry["max_ms"], millis)
+            entry["documents"] += _documents(reply)
+
+            if reply.get("cursor", {}).get("id"):
+                if len(self._cursors) >= MAX_SHAPES:
+                    # Cursors closed early never report id 0; forget the oldest
+                    self._cursors.pop(next(iter(self._cursors)))
+                self._cursors[reply["cursor"]["id"]] = key
+            elif cursor_id is not None:
+                self._cursors.pop(cursor_id, None)
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+            self._cursors.clear()
+            self.dropped = 0
+
+    def report(self, limit: int = 20) -> dict:
+        """Shapes ranked by total time.
+
+        count, failures, total_ms and documents are estimates scaled up by
+        1 / sample_rate; `sampled` is the raw count, and avg_ms and max_ms
+        come from the sampled commands as recorded.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._shapes.values()]
+        entries.sort(key=lambda e: e["total_ms"], reverse=True)
+        for entry in entries:
+            entry["sampled"] = entry["count"]
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 3) if entry["count"] else None
+            entry["max_ms"] = round(entry["max_ms"], 3)
+            for field in ("count", "failures", "documents"):
+                entry[field] = round(entry[field] / self.sample_rate)
+            entry["total_ms"] = round(entry["total_ms"] / self.sample_rate, 3)
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "estimated_total_ms": round(sum(e["total_ms"] for e in entries), 3),
+            "shapes": len(entries),
+            "dropped_shapes": self.dropped,
+            "top": entries[:limit],
+        }
+
+
+async def profile_report(db, limit: int) -> list:
+    """Rank system.profile entries by shape, including documents examined"""
+    shapes = {}
+    async for entry in db["system.profile"].find({"command": {"$exists": True}}):
+        command = entry["command"]
+        command_name = next(iter(command), "")
+        if command_name in IGNORED_COMMANDS:
+            continue
+        collection = entry.get("ns", "").partition(".")[2]
+        shape = command_shape(command_name, command)
+        key = json.dumps([command_name, collection, shape], sort_keys=True, default=str)
+        stats = shapes.setdefault(key, {
+            "command": command_name,
+            "collection": collection,
+            "shape": shape,
+            "count": 0,
+            "total_ms": 0,
+            "max_ms": 0,
+            "docs_examined": 0,
+            "keys_examined": 0,
+            "documents": 0,
+            "plans": set(),
+        })
+        stats["count"] += 1
+        stats["total_ms"] += entry.get("millis", 0)
+        stats["max_ms"] = max(stats["max_ms"], entry.get("millis", 0))
+        stats["docs_examined"] += entry.get("docsExamined", 0)
+        stats["keys_examined"] += entry.get("keysExamined", 0)
+        stats["documents"] += entry.get("nreturned", entry.get("nModified", 0))
+        if entry.get("planSummary"):
+            stats["plans"].add(entry["planSummary"])
+
+    ranked = sorted(shapes.values(), key=lambda s: s["total_ms"], reverse=True)[:limit]
+    for stats in ranked:
+        stats["plans"] = sorted(stats["plans"])
+    return ranked
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enable", action="store_true", help="turn on the database profiler and exit")
+    parser.add_argument("--disable", action="store_true", help="turn off the database profiler and exit")
+    parser.add_argument("--slowms", type=int, default=100, help="record operations slower than this")
+    parser.add_argument("--sample-rate", type=float, default=1.0, help="fraction of slow operations to record")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    # database imports this module for its command listener
+    from database import create_client
+
+    load_dotenv()
+    client = create_client()
+    db = client[os.environ["DB_NAME"]]
+
+    if args.enable or args.disable:
+        await db.command({
+            "profile": 1 if args.enable else 0,
+            "slowms": args.slowms,
+            "sampleRate": args.sample_rate,
+        })
+        print(f"Database profiler {'enabled' if args.enable else 'disabled'}")
+    else:
+        print(json.dumps(await profile_report(db, args.limit), indent=2, default=str))
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
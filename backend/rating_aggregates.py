@@ -0,0 +1,96 @@
+"""Running rating aggregates kept on user documents.
+
+Each new rating adds to `rating_sum` and `total_ratings` in one atomic update
+and re-derives `average_rating` from them. Run `python rating_aggregates.py`
+to rebuild every user's aggregates from the ratings collection.
+"""
+import asyncio
+import os
+
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+from database import create_client
+from trust_score import DEFAULT_METRICS, trust_update
+
+# Users rated before rating_sum existed fall back to average * count, rounded to
+# keep rating_sum integral; the reconcile below restores the exact sum
+_CURRENT_SUM = {"$ifNull": [
+    "$rating_sum",
+    {"$toInt": {"$round": [
+        {"$multiply": [{"$ifNull": ["$average_rating", 0]}, {"$ifNull": ["$total_ratings", 0]}]}, 0
+    ]}}
+]}
+
+
+def add_rating_update(rating: int) -> list:
+    """Pipeline update that folds one rating into a user's aggregates"""
+    return [
+        {"$set": {
+            "rating_sum": {"$add": [_CURRENT_SUM, rating]},
+            "total_ratings": {"$add": [{"$ifNull": ["$total_ratings", 0]}, 1]}
+        }},
+        {"$set": {
+            "average_rating": {"$round": [{"$divide": ["$rating_sum", "$total_ratings"]}, 1]}
+        }}
+    ]
+
+
+# Users written per bulk_write while reconciling
+RECONCILE_BATCH = 1000
+
+# Aggregates of a user whose ratings were all removed
+_UNRATED = [{"$set": {"rating_sum": 0, "total_ratings": 0, "average_rating": 0.0}}] + trust_update(
+    {"rating": DEFAULT_METRICS["rating"]}
+)
+
+
+async def _flush(users, updates: list) -> list:
+    if updates:
+        await users.bulk_write(updates, ordered=False)
+    return []
+
+
+async def reconcile_rating_aggregates(db) -> int:
+    """Rebuild rating aggregates for every user from the ratings collection"""
+    pipeline = [{"$group": {"_id": "$ratee_id", "sum": {"$sum": "$rating"}, "count": {"$sum": 1}}}]
+    updates = []
+    rated_ids = set()
+    async for row in db.ratings.aggregate(pipeline):
+        rated_ids.add(row["_id"])
+        updates.append(UpdateOne(
+            {"id": row["_id"]},
+            [{"$set": {
+                "rating_sum": row["sum"],
+                "total_ratings": row["count"],
+                "average_rating": round(row["sum"] / row["count"], 1)
+            }}] + trust_update({"rating": "$average_rating"})
+        ))
+        if len(updates) >= RECONCILE_BATCH:
+            updates = await _flush(db.users, updates)
+
+    # Only users that still claim ratings can be stale; id-less documents are never touched
+    stale = db.users.find({"id": {"$type": "string"}, "total_ratings": {"$gt": 0}}, {"_id": 0, "id": 1})
+    async for user in stale:
+        if user["id"] not in rated_ids:
+            updates.append(UpdateOne({"id": user["id"]}, _UNRATED))
+            if len(updates) >= RECONCILE_BATCH:
+                updates = await _flush(db.users, updates)
+
+    await _flush(db.users, updates)
+    return len(rated_ids)
+
+
+async def main():
+    load_dotenv()
+    client = create_client()
+    db = client[os.environ["DB_NAME"]]
+
+    reconciled = await reconcile_rating_aggregates(db)
+    print(f"Reconciled rating aggregates for {reconciled} users")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
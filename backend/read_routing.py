@@ -0,0 +1,55 @@
+"""Per-route read routing between the primary and secondaries.
+
+Routes named in READ_REPLICA_ROUTES (comma separated; defaults below) read
+through `database.replica_db` with secondaryPreferred and a max staleness of
+MONGO_MAX_STALENESS_SECONDS. Every other route, and anything that must see
+its own writes (`/auth/me` after register, `apply_job`), reads the primary.
+Against a standalone mongod both handles reach the same server.
+
+`python read_routing.py` asks the member that serves each route's reads to
+identify itself, to check the routing against a local replica set.
+"""
+import asyncio
+import os
+
+import database
+
+# Listings and aggregate stats that tolerate replication lag
+DEFAULT_REPLICA_ROUTES = {
+    "get_jobs",
+    "get_workers",
+    "get_schemes",
+    "get_user_ratings",
+    "get_daily_stats",
+    # get_impact_stats and get_admin_stats, through the shared PlatformStats
+    "stats",
+}
+
+
+def configured_routes() -> set:
+    configured = os.environ.get("READ_REPLICA_ROUTES")
+    if configured is None:
+        return set(DEFAULT_REPLICA_ROUTES)
+    return {route.strip() for route in configured.split(",") if route.strip()}
+
+
+replica_routes = configured_routes()
+
+
+def reads(route: str):
+    """Database handle a route should read through"""
+    return database.replica_db if route in replica_routes else database.db
+
+
+async def main():
+    database.connect()
+    for route in sorted(replica_routes | {"primary"}):
+        target = reads(route)
+        hello = await target.command("hello", read_preference=target.read_preference)
+        role = "primary" if hello.get("isWritablePrimary") else "secondary"
+        print(f"{route}: {target.read_preference.mongos_mode} -> {hello.get('me', 'standalone')} ({role})")
+    database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
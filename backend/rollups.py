@@ -0,0 +1,132 @@
+"""Pre-aggregated daily counters in the `daily_rollups` collection.
+
+Each write path bumps per-day counters for the platform as a whole and for
+the worker and job category involved, so analytics read one document per day
+instead of scanning raw events. Run `python rollups.py` to rebuild the
+collection from the raw `jobs`, `sos_alerts` and `ratings` collections.
+"""
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, UpdateOne
+
+from database import create_client
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "daily_rollups"
+
+PLATFORM = "platform"
+
+# Backfill sources: (collection, filter, counter, date field, {scope: key field}, value)
+SOURCES = [
+    ("jobs", {}, "jobs_created", "$created_at", {"category": "$category"}, 1),
+    ("jobs", {"worker_id": {"$ne": None}}, "jobs_assigned", {"$ifNull": ["$assigned_at", "$created_at"]},
+     {"worker": "$worker_id", "category": "$category"}, 1),
+    ("jobs", {"status": "completed", "worker_id": {"$ne": None}}, "jobs_completed",
+     {"$ifNull": ["$completed_at", {"$ifNull": ["$assigned_at", "$created_at"]}]},
+     {"worker": "$worker_id", "category": "$category"}, 1),
+    ("sos_alerts", {}, "sos_triggered", "$created_at", {"worker": "$worker_id"}, 1),
+    ("ratings", {}, "ratings_received", "$created_at", {"worker": "$ratee_id"}, 1),
+    ("ratings", {}, "rating_points", "$created_at", {"worker": "$ratee_id"}, "$rating"),
+]
+
+
+def _day(at: datetime) -> str:
+    return at.astimezone(timezone.utc).date().isoformat()
+
+
+def _upsert(day: str, scope: str, key, counters: dict) -> UpdateOne:
+    return UpdateOne(
+        {"_id": f"{day}|{scope}|{key}"},
+        {"$inc": counters, "$setOnInsert": {"day": day, "scope": scope, "key": key}},
+        upsert=True
+    )
+
+
+async def record(db, counters: dict, at: datetime, **keys):
+    """Add `counters` to the platform rollup and to each given scope's rollup for the day of `at`"""
+    day = _day(at)
+    updates = [_upsert(day, PLATFORM, None, counters)]
+    updates += [_upsert(day, scope, key, counters) for scope, key in keys.items() if key is not None]
+    await db[COLLECTION].bulk_write(updates, ordered=False)
+
+
+# Strong references to in-flight background writes until they finish
+_background = set()
+
+
+async def _record_logged(db, counters: dict, at: datetime, keys: dict):
+    try:
+        await record(db, counters, at, **keys)
+    except Exception as exc:
+        logger.error(f"Rollup write {counters} failed: {exc}")
+
+
+def record_in_background(db, counters: dict, at: datetime, **keys):
+    """Schedule `record` off the request path; a failure is logged, never raised"""
+    task = asyncio.create_task(_record_logged(db, counters, at, keys))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def read_rollups(db, scope: str = PLATFORM, key=None, days: int = 7) -> list:
+    """Daily counters for one scope over the last `days` days, oldest first"""
+    since = _day(datetime.now(timezone.utc) - timedelta(days=days - 1))
+    return await db[COLLECTION].find(
+        {"scope": scope, "key": key, "day": {"$gte": since}},
+        {"_id": 0}
+    ).sort("day", ASCENDING).to_list(days)
+
+
+async def weekday_totals(db, counter: str, scope: str, key) -> dict:
+    """All-time totals of one counter per ISO weekday (1 = Monday) for one scope"""
+    totals = {}
+    rows = db[COLLECTION].find({"scope": scope, "key": key, counter: {"$gt": 0}}, {"_id": 0, "day": 1, counter: 1})
+    async for row in rows:
+        weekday = date.fromisoformat(row["day"]).isoweekday()
+        totals[weekday] = totals.get(weekday, 0) + row[counter]
+    return totals
+
+
+async def backfill(db):
+    """Rebuild every rollup from the raw event collections"""
+    await db[COLLECTION].delete_many({})
+
+    for collection, match, counter, date_field, scopes, value in SOURCES:
+        keys = {"day": {"$dateToString": {"format": "%Y-%m-%d", "date": {"$toDate": date_field}}}}
+        keys.update(scopes)
+        pipeline = [{"$match": match}, {"$group": {"_id": keys, "n": {"$sum": value}}}]
+
+        updates = []
+        async for row in db[collection].aggregate(pipeline):
+            group = row["_id"]
+            counters = {counter: row["n"]}
+            updates.append(_upsert(group["day"], PLATFORM, None, counters))
+            updates += [
+                _upsert(group["day"], scope, group.get(scope), counters)
+                for scope in scopes if group.get(scope) is not None
+            ]
+            if len(updates) >= 1000:
+                await db[COLLECTION].bulk_write(updates, ordered=False)
+                updates = []
+        if updates:
+            await db[COLLECTION].bulk_write(updates, ordered=False)
+
+
+async def main():
+    load_dotenv()
+    client = create_client()
+    db = client[os.environ["DB_NAME"]]
+
+    await backfill(db)
+    print("Daily rollups rebuilt")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
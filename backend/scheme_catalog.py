@@ -0,0 +1,135 @@
+"""In-process cache of the government scheme catalog.
+
+The catalog is loaded and validated once, pre-serialized to JSON bytes and
+indexed by category and state. Writers call `bump_catalog_version` after
+changing the schemes collection; readers notice the new version stamp within
+`check_interval` seconds and reload.
+"""
+import asyncio
+import hashlib
+import json
+import time
+
+from search import BM25Index
+
+VERSION_COLLECTION = "catalog_versions"
+VERSION_KEY = "schemes"
+
+
+async def bump_catalog_version(db):
+    """Mark the cached scheme catalog as stale in every server process"""
+    await db[VERSION_COLLECTION].update_one(
+        {"_id": VERSION_KEY},
+        {"$inc": {"version": 1}},
+        upsert=True
+    )
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class SchemeCatalog:
+    def __init__(self, db, model, check_interval: float = 30.0):
+        self.db = db
+        self.model = model
+        self.check_interval = check_interval
+        self.version = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._schemes = {}
+        self._by_category = {}
+        self._by_state = {}
+        self._bodies = {}
+        self._search_index = BM25Index()
+
+    async def _current_version(self) -> int:
+        doc = await self.db[VERSION_COLLECTION].find_one({"_id": VERSION_KEY})
+        return doc["version"] if doc else 0
+
+    async def _load(self, version: int):
+        schemes = {}
+        by_category = {}
+        by_state = {}
+        async for doc in self.db.schemes.find({}, {"_id": 0}):
+            scheme = self.model(**doc).model_dump(mode="json")
+            schemes[scheme["id"]] = scheme
+            by_category.setdefault(scheme["category"], []).append(scheme["id"])
+            by_state.setdefault(scheme["state"], []).append(scheme["id"])
+
+        self._schemes = schemes
+        self._by_category = by_category
+        self._by_state = by_state
+        self._bodies = {}
+        # Titles count twice towards relevance
+        self._search_index = BM25Index.build({
+            scheme_id: " ".join([
+                s["title"], s["title"], s["category"], s["description"], s["eligibility"], s["benefits"]
+            ])
+            for scheme_id, s in schemes.items()
+        })
+        self.version = version
+
+    async def ensure_fresh(self):
+        """Reload the catalog if its version stamp moved since the last check"""
+        if self.version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+
+        async with self._lock:
+            if self.version is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            version = await self._current_version()
+            if version != self.version:
+                await self._load(version)
+            self._checked_at = time.monotonic()
+
+    def _encode(self, key, value) -> tuple:
+        """Serialize a response once per catalog version and remember its ETag"""
+        cached = self._bodies.get(key)
+        if cached is None:
+            body = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+            cached = (body, _etag(body))
+            self._bodies[key] = cached
+        return cached
+
+    async def list(self, category=None, state=None) -> tuple:
+        """Return (body, etag) for the schemes matching the filters"""
+        await self.ensure_fresh()
+
+        # Unknown filter values match nothing; don't grow the body cache for them
+        if (category is not None and category not in self._by_category) or \
+                (state is not None and state not in self._by_state):
+            return self._encode(("list", None, None, "empty"), [])
+
+        ids = list(self._schemes)
+        if category is not None:
+            ids = self._by_category[category]
+        if state is not None:
+            state_ids = set(self._by_state[state])
+            ids = [i for i in ids if i in state_ids]
+
+        return self._encode(("list", category, state), [self._schemes[i] for i in ids])
+
+    async def get(self, scheme_id: str):
+        """Return (body, etag) for one scheme, or None if it does not exist"""
+        await self.ensure_fresh()
+
+        scheme = self._schemes.get(scheme_id)
+        if scheme is None:
+            return None
+        return self._encode(("one", scheme_id), scheme)
+
+    async def search(self, query: str, offset: int = 0, limit: int = 20) -> dict:
+        """Ranked keyword search over the catalog"""
+        await self.ensure_fresh()
+
+        ranked = self._search_index.search(query)
+        page = ranked[offset:offset + limit]
+        return {
+            "total": len(ranked),
+            "results": [{**self._schemes[scheme_id], "score": round(score, 4)} for scheme_id, score in page]
+        }
+
+    async def autocomplete(self, prefix: str, limit: int = 10) -> list:
+        await self.ensure_fresh()
+        return self._search_index.complete(prefix, limit)
@@ -0,0 +1,66 @@
+"""Small in-process BM25 index with prefix autocomplete, used for the scheme catalog."""
+import bisect
+import math
+import re
+from collections import Counter
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "to", "up", "with",
+}
+
+
+def tokenize(text: str) -> list:
+    return [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._lengths = {}
+        self._avg_length = 0.0
+        self._vocabulary = []
+
+    @classmethod
+    def build(cls, documents: dict, **params) -> "BM25Index":
+        """Index {doc_id: text}"""
+        index = cls(**params)
+        for doc_id, text in documents.items():
+            tokens = tokenize(text)
+            index._lengths[doc_id] = len(tokens)
+            for term, count in Counter(tokens).items():
+                index._postings.setdefault(term, {})[doc_id] = count
+        if index._lengths:
+            index._avg_length = sum(index._lengths.values()) / len(index._lengths)
+        index._vocabulary = sorted(index._postings)
+        return index
+
+    def _idf(self, term: str) -> float:
+        n = len(self._lengths)
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str) -> list:
+        """All matching doc ids as (doc_id, score), best first"""
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for doc_id, tf in postings.items():
+                norm = 1 - self.b + self.b * self._lengths[doc_id] / self._avg_length
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def complete(self, prefix: str, limit: int = 10) -> list:
+        """Indexed terms starting with `prefix`, most frequent first"""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        terms = self._vocabulary[start:end]
+        return sorted(terms, key=lambda t: len(self._postings[t]), reverse=True)[:limit]
@@ -1,10 +1,13 @@
 import asyncio
 import os
+import random
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
+
+from database import create_client
+from trust_score import DEFAULT_METRICS, compute_trust_score
 
 load_dotenv()
 
@@ -12,8 +15,118 @@ MONGO_URL = os.getenv("MONGO_URL")
 DB_NAME = os.getenv("DB_NAME")
 
 
+# ---------------- SYNTHETIC DATA (benchmarks) ---------------- #
+
+CATEGORIES = ["Cleaning", "Delivery", "Beauty", "Tutoring", "Cooking", "Caregiving", "Tailoring"]
+LOCALITIES = [
+    "Koramangala", "Indiranagar", "Whitefield", "HSR Layout", "Jayanagar",
+    "Malleswaram", "JP Nagar", "BTM Layout", "Marathahalli", "Electronic City",
+]
+# Bounding box of greater Bangalore, for synthetic job coordinates
+LAT_RANGE = (12.80, 13.15)
+LNG_RANGE = (77.45, 77.80)
+
+
+def with_trust_score(user: dict) -> dict:
+    """Seeded users carry the materialized trust score like registered ones"""
+    metrics = {**DEFAULT_METRICS, "rating": user["rating"]}
+    return {**user, "trust_metrics": metrics, "trust_score": compute_trust_score(metrics)}
+
+
+def generate_users(count: int, role: str, password_hash: str, rng: random.Random):
+    """Yield `count` users of one role, all sharing the same password hash"""
+    for i in range(count):
+        yield with_trust_score({
+            "id": str(uuid.uuid4()),
+            "name": f"{role.title()} {i}",
+            "email": f"{role}{i}@bench.swayam",
+            "phone": f"+91-{9000000000 + i}",
+            "password": password_hash,
+            "role": role,
+            "verified": rng.random() < 0.8,
+            "rating": round(rng.uniform(3.5, 5.0), 1),
+            "skills": rng.sample(CATEGORIES, 2) if role == "worker" else [],
+            "created_at": datetime.now(timezone.utc) - timedelta(minutes=i),
+        })
+
+
+def generate_jobs(count: int, employers: list, rng: random.Random):
+    """Yield `count` open jobs spread over the given employers"""
+    for i in range(count):
+        employer = rng.choice(employers)
+        category = rng.choice(CATEGORIES)
+        yield {
+            "id": str(uuid.uuid4()),
+            "title": f"{category} job {i}",
+            "category": category,
+            "description": f"{category} work for a household in the neighbourhood.",
+            "location": f"{rng.choice(LOCALITIES)}, Bangalore",
+            "pay": float(rng.randrange(300, 2000, 50)),
+            "duration": f"{rng.randint(1, 8)} hours",
+            "employer_id": employer["id"],
+            "employer_name": employer["name"],
+            "geo": {"type": "Point", "coordinates": [
+                round(rng.uniform(*LNG_RANGE), 6), round(rng.uniform(*LAT_RANGE), 6)
+            ]},
+            "status": "open",
+            "worker_id": None,
+            "worker_name": None,
+            "safety_fee": 2.0,
+            "created_at": datetime.now(timezone.utc) - timedelta(seconds=i),
+        }
+
+
+SCHEME_CATEGORIES = ["Loan", "Healthcare", "Welfare", "Education", "Skill Development", "Housing"]
+SCHEME_STATES = ["All India", "Karnataka", "Tamil Nadu", "Maharashtra", "Kerala", "Telangana"]
+SCHEME_WORDS = [
+    "loan", "health", "insurance", "pension", "skill", "training", "housing", "maternity",
+    "scholarship", "subsidy", "welfare", "credit", "livelihood", "nutrition", "childcare",
+    "transport", "savings", "startup", "artisan", "dairy", "tailoring", "digital", "literacy",
+    "enterprise", "widow", "disability", "rural", "urban", "self", "help", "group", "stipend",
+]
+
+
+def generate_schemes(count: int, rng: random.Random):
+    """Yield `count` schemes with varied wording, for catalog and search benchmarks"""
+    for i in range(count):
+        words = rng.sample(SCHEME_WORDS, 8)
+        yield {
+            "id": str(uuid.uuid4()),
+            "title": f"{words[0].title()} {words[1].title()} Scheme {i}",
+            "description": f"Support for women workers: {' '.join(words[2:])}.",
+            "category": rng.choice(SCHEME_CATEGORIES),
+            "eligibility": f"Women workers eligible for {words[2]} and {words[3]}",
+            "benefits": f"Financial support for {words[4]}",
+            "how_to_apply": "Apply online",
+            "state": rng.choice(SCHEME_STATES),
+            "icon": "shield",
+            "created_at": datetime.now(timezone.utc),
+        }
+
+
+def generate_ratings(count: int, workers: list, employers: list, rng: random.Random):
+    """Yield `count` employer-to-worker ratings"""
+    for i in range(count):
+        worker = rng.choice(workers)
+        employer = rng.choice(employers)
+        yield {
+            "id": str(uuid.uuid4()),
+            "job_id": str(uuid.uuid4()),
+            "job_title": f"Job {i}",
+            "rater_id": employer["id"],
+            "rater_name": employer["name"],
+            "rater_role": "employer",
+            "ratee_id": worker["id"],
+            "ratee_name": worker["name"],
+            "ratee_role": "worker",
+            "rating": rng.randint(3, 5),
+            "review": None,
+            "created_at": datetime.now(timezone.utc) - timedelta(seconds=i),
+        }
+
+
 async def seed_database():
-    client = AsyncIOMotorClient(MONGO_URL)
+    client = create_client(MONGO_URL)
     db = client[DB_NAME]
 
     print("\nResetting database collections...\n")
@@ -35,7 +148,7 @@ async def seed_database():
             "role": "worker",
             "verified": True,
             "rating": 4.8,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -45,7 +158,7 @@ async def seed_database():
             "role": "worker",
             "verified": True,
             "rating": 4.9,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -55,7 +168,7 @@ async def seed_database():
             "role": "worker",
             "verified": True,
             "rating": 4.7,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
     ]
 
@@ -68,7 +181,7 @@ async def seed_database():
             "role": "employer",
             "verified": True,
             "rating": 4.6,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -78,11 +191,11 @@ async def seed_database():
             "role": "employer",
             "verified": True,
             "rating": 4.8,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
     ]
 
-    await db.users.insert_many(workers + employers)
+    await db.users.insert_many([with_trust_score(user) for user in workers + employers])
 
     # ---------------- JOBS ---------------- #
 
@@ -101,7 +214,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -117,7 +230,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -133,7 +246,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -149,7 +262,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -165,7 +278,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -181,7 +294,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
                 {
             "id": str(uuid.uuid4()),
@@ -197,7 +310,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -213,7 +326,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -229,7 +342,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -245,7 +358,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -261,7 +374,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -277,7 +390,7 @@ async def seed_database():
             "worker_id": None,
             "worker_name": None,
             "safety_fee": 2.0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
 
     ]
@@ -4,7 +4,9 @@ import uuid
 from datetime import datetime, timezone
 
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
+
+from database import create_client
+from scheme_catalog import bump_catalog_version
 
 load_dotenv()
 
@@ -13,7 +15,7 @@ DB_NAME = os.getenv("DB_NAME")
 
 
 async def seed_schemes():
-    client = AsyncIOMotorClient(MONGO_URL)
+    client = create_client(MONGO_URL)
     db = client[DB_NAME]
 
     print("\nAdding government schemes into database...\n")
@@ -30,7 +32,7 @@ async def seed_schemes():
             "external_link": "https://pmsvanidhi.mohua.gov.in",
             "state": "All India",
             "icon": "banknote",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -43,7 +45,7 @@ async def seed_schemes():
             "external_link": "https://www.mudra.org.in",
             "state": "All India",
             "icon": "wallet",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -56,7 +58,7 @@ async def seed_schemes():
             "external_link": "https://nulm.gov.in",
             "state": "All India",
             "icon": "graduation-cap",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -69,7 +71,7 @@ async def seed_schemes():
             "external_link": "https://www.standupmitra.in",
             "state": "All India",
             "icon": "trending-up",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -82,7 +84,7 @@ async def seed_schemes():
             "external_link": "https://wcd.nic.in",
             "state": "All India",
             "icon": "heart",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -95,7 +97,7 @@ async def seed_schemes():
             "external_link": "https://www.pmkvyofficial.org",
             "state": "All India",
             "icon": "award",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -108,7 +110,7 @@ async def seed_schemes():
             "external_link": "https://wcd.nic.in",
             "state": "All India",
             "icon": "users",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
         {
             "id": str(uuid.uuid4()),
@@ -121,13 +123,15 @@ async def seed_schemes():
             "external_link": "https://pmjay.gov.in",
             "state": "All India",
             "icon": "heart-pulse",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
         },
     ]
 
     # Reset schemes collection
     await db.schemes.delete_many({})
     await db.schemes.insert_many(schemes)
+    # Tell running servers to reload their cached catalog
+    await bump_catalog_version(db)
 
     print(f"Done. Inserted {len(schemes)} schemes.\n")
     client.close()
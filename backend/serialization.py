@@ -0,0 +1,44 @@
+"""Fast JSON path for list endpoints.
+
+Documents are fetched with a projection limited to the response model's
+fields, topped up with the model's static defaults and encoded straight to
+JSON with orjson, skipping per-row Pydantic construction and validation.
+"""
+import orjson
+from fastapi.responses import Response
+
+
+def projection(model) -> dict:
+    """Mongo projection selecting exactly the fields of a response model"""
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+
+def static_defaults(model, fields=None) -> dict:
+    """Plain (non-factory) defaults of a model, optionally limited to `fields`"""
+    defaults = {}
+    for name, field in model.model_fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if not field.is_required() and field.default_factory is None:
+            defaults[name] = field.default
+    return defaults
+
+
+def dumps(value) -> bytes:
+    """Compact UTF-8 JSON; datetimes become ISO 8601 strings, as with isoformat()"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RowSerializer:
+    """Encodes Mongo documents as one response model without building instances"""
+
+    def __init__(self, model, defaults_from=None):
+        self.projection = projection(model)
+        self.defaults = static_defaults(defaults_from or model, fields=model.model_fields)
+
+    def row(self, doc: dict) -> dict:
+        return {**self.defaults, **doc}
+
+    def response(self, docs, headers=None) -> Response:
+        body = dumps([self.row(doc) for doc in docs])
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -1,36 +1,89 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import List, Optional, Literal
 import uuid
 from datetime import datetime, timezone
 
 # Import auth utilities
 from auth import (
-    hash_password, 
-    verify_password, 
+    password_hasher,
+    principal_cache,
     create_access_token,
     get_current_user,
     get_current_admin,
     get_current_worker,
-    get_current_employer
+    get_current_employer,
+    require_authenticated_user
 )
+import database
+from database import db, pool_monitors, query_profiler, sos_db
+from bulk_import import BulkJobImport, UploadError, iter_rows
+from compression import CompressionMiddleware
+from events import TOPICS, EventBus
+from geocoding import Geocoder
+from indexes import ensure_indexes
+from job_matching import JobMatcher
+from main import dashboard_cache, worker_router
+import metrics
+from pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    KEYSET_SORT,
+    decode_distance_cursor,
+    encode_cursor,
+    encode_token,
+    keyset_query
+)
+import rollups
+from rating_aggregates import add_rating_update, reconcile_rating_aggregates
+from read_routing import reads
+from scheme_catalog import SchemeCatalog
+from sos_dispatch import SOSDispatcher, load_notifiers
+from serialization import RowSerializer
+from stats import PlatformStats
+from trust_score import DEFAULT_TRUST_SCORE, backfill_trust_scores, record_job_completed, trust_update
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
-app = FastAPI()
-api_router = APIRouter(prefix="/api")
+event_bus = EventBus()
+geocoder = Geocoder(db)
+# Open-job matching index, kept current from job events
+job_matcher = JobMatcher()
+event_bus.add_listener(job_matcher.on_event)
+sos_dispatcher = SOSDispatcher(load_notifiers(), workers=int(os.environ.get('SOS_DISPATCH_WORKERS', '2')))
+platform_stats = PlatformStats(reads("stats"), ttl=float(os.environ.get('STATS_CACHE_TTL', '30')))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with database.lifespan(app):
+        await ensure_indexes(db)
+        # Users stored before trust_score was materialized would miss its indexed predicates
+        await backfill_trust_scores(db.users, only_missing=True)
+        sos_dispatcher.start()
+        await job_matcher.load(db.jobs)
+        event_bus.start(db)
+        interval = os.environ.get('STATS_REFRESH_INTERVAL')
+        if interval:
+            platform_stats.start_refresher(float(interval))
+
+        yield
+
+        platform_stats.stop_refresher()
+        event_bus.stop()
+        await sos_dispatcher.stop()
+    password_hasher.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+api_router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 
 
 # ============ CENTRALIZED ERROR HANDLING ============
@@ -64,6 +117,19 @@ async def general_exception_handler(request, exc):
 
 # ============ MODELS ============
 
+class GeoPoint(BaseModel):
+    """GeoJSON point; coordinates are [longitude, latitude]"""
+    type: Literal["Point"] = "Point"
+    coordinates: List[float] = Field(min_length=2, max_length=2)
+
+    @field_validator("coordinates")
+    @classmethod
+    def check_range(cls, value):
+        lng, lat = value
+        if not (-180 <= lng <= 180 and -90 <= lat <= 90):
+            raise ValueError("coordinates must be [longitude, latitude]")
+        return value
+
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -82,7 +148,10 @@ class User(BaseModel):
         "reference_verified": False
     }
     total_ratings: int = 0
+    rating_sum: int = 0
     average_rating: float = 0.0
+    trust_score: int = DEFAULT_TRUST_SCORE
+    geo: Optional[GeoPoint] = None
 
 class UserResponse(BaseModel):
     """User response without password"""
@@ -98,6 +167,7 @@ class UserResponse(BaseModel):
     verifications: dict = {}
     total_ratings: int = 0
     average_rating: float = 0.0
+    geo: Optional[GeoPoint] = None
 
 class UserCreate(BaseModel):
     name: str
@@ -130,6 +200,7 @@ class Job(BaseModel):
     worker_id: Optional[str] = None
     worker_name: Optional[str] = None
     safety_fee: float = 2.0
+    geo: Optional[GeoPoint] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class JobCreate(BaseModel):
@@ -141,6 +212,7 @@ class JobCreate(BaseModel):
     duration: str
     employer_id: str
     employer_name: str
+    geo: Optional[GeoPoint] = None
 
 class JobApply(BaseModel):
     worker_id: str
@@ -177,6 +249,7 @@ class SOSAlert(BaseModel):
     job_id: Optional[str] = None
     location: str
     emergency_type: str
+    geo: Optional[GeoPoint] = None
     status: Literal["triggered", "responded", "resolved"] = "triggered"
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -186,6 +259,7 @@ class SOSCreate(BaseModel):
     job_id: Optional[str] = None
     location: str
     emergency_type: str
+    geo: Optional[GeoPoint] = None
 
 class ImpactStats(BaseModel):
     total_workers: int
@@ -240,10 +314,44 @@ class Scheme(BaseModel):
 class UpdateSkills(BaseModel):
     skills: List[str]
 
+class UpdateLocation(BaseModel):
+    location: Optional[str] = None
+    geo: GeoPoint
+
 class UpdateVerification(BaseModel):
     verification_type: Literal["phone_verified", "id_verified", "reference_verified"]
     status: bool
 
+# Fast-path serializers for list endpoints
+job_rows = RowSerializer(Job)
+user_rows = RowSerializer(UserResponse, defaults_from=User)
+policy_rows = RowSerializer(SafetyPolicy)
+sos_rows = RowSerializer(SOSAlert)
+rating_rows = RowSerializer(Rating)
+
+scheme_catalog = SchemeCatalog(
+    reads("get_schemes"),
+    Scheme,
+    check_interval=float(os.environ.get('SCHEME_CATALOG_CHECK_INTERVAL', '30'))
+)
+
+# ============ HELPERS ============
+
+async def stream_ndjson(cursor, model):
+    """Yield each document of a Motor cursor as one line of NDJSON"""
+    async for doc in cursor:
+        yield model(**doc).model_dump_json() + "\n"
+
+def conditional_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve pre-encoded JSON with a strong ETag, answering If-None-Match with 304"""
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if_none_match = request.headers.get("if-none-match", "")
+    # Weak comparison: compressed responses carry the weak form of the tag
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if etag in tags or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 # ============ API ENDPOINTS ============
 
 @api_router.get("/")
@@ -262,7 +370,7 @@ async def register(user_data: UserCreate):
         )
     
     # Hash password
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     
     # Create user with hashed password
     user_dict = user_data.model_dump()
@@ -270,7 +378,6 @@ async def register(user_data: UserCreate):
     user = User(**user_dict)
     
     doc = user.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.users.insert_one(doc)
     
     # Create access token
@@ -302,16 +409,12 @@ async def login(login_data: LoginRequest):
         )
     
     # Verify password
-    if not verify_password(login_data.password, user['password']):
+    if not await password_hasher.verify(login_data.password, user['password']):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
-    # Convert datetime if needed
-    if isinstance(user['created_at'], str):
-        user['created_at'] = datetime.fromisoformat(user['created_at'])
-    
     # Create access token
     access_token = create_access_token(
         data={
@@ -337,65 +440,195 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     user = await db.users.find_one({"id": current_user["id"]}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    if isinstance(user['created_at'], str):
-        user['created_at'] = datetime.fromisoformat(user['created_at'])
+
     
     user_obj = User(**user)
     return UserResponse(**{k: v for k, v in user_obj.model_dump().items() if k != 'password'})
 
 # ===== JOBS =====
 @api_router.get("/jobs", response_model=List[Job])
-async def get_jobs(status: Optional[str] = None, category: Optional[str] = None):
+async def get_jobs(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: Literal["json", "ndjson"] = "json"
+):
+    """List jobs newest first using keyset pagination.
+
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    With format=ndjson the matching jobs are streamed one per line instead.
+    """
     query = {}
     if status:
         query["status"] = status
     if category:
         query["category"] = category
+    query = keyset_query(query, cursor)
+
+    if format == "ndjson":
+        jobs_cursor = reads("get_jobs").jobs.find(query, {"_id": 0}).sort(KEYSET_SORT).batch_size(MAX_PAGE_SIZE)
+        if limit:
+            jobs_cursor = jobs_cursor.limit(limit)
+        return StreamingResponse(stream_ndjson(jobs_cursor, Job), media_type="application/x-ndjson")
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    # Fetch one extra row to learn whether another page exists
+    jobs = await reads("get_jobs").jobs.find(query, job_rows.projection).sort(KEYSET_SORT).limit(page_size + 1).to_list(page_size + 1)
+    headers = {}
+    if len(jobs) > page_size:
+        jobs = jobs[:page_size]
+        headers["X-Next-Cursor"] = encode_cursor(jobs[-1]['created_at'], jobs[-1]['id'])
+    return job_rows.response(jobs, headers=headers)
+
+@api_router.get("/jobs/nearby", response_model=List[Job])
+async def get_nearby_jobs(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(5.0, gt=0, le=50, description="Search radius in km"),
+    status: Optional[str] = "open",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Jobs with coordinates within `radius` km, nearest first.
+
+    Pages are keyed on (distance, id); the next cursor is returned in the
+    X-Next-Cursor header.
+    """
+    near = {
+        "near": {"type": "Point", "coordinates": [lng, lat]},
+        "distanceField": "distance_m",
+        "maxDistance": radius * 1000,
+        "spherical": True,
+        "key": "geo",
+    }
+    if status:
+        near["query"] = {"status": status}
+    
+    pipeline = [{"$geoNear": near}]
+    if cursor:
+        distance, doc_id = decode_distance_cursor(cursor)
+        near["minDistance"] = distance
+        pipeline.append({"$match": {"$or": [
+            {"distance_m": {"$gt": distance}},
+            {"distance_m": distance, "id": {"$gt": doc_id}},
+        ]}})
+    pipeline += [
+        {"$sort": {"distance_m": 1, "id": 1}},
+        {"$limit": limit + 1},
+        {"$project": {**job_rows.projection, "distance_m": 1}},
+    ]
+    
+    jobs = await db.jobs.aggregate(pipeline).to_list(limit + 1)
+    headers = {}
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        headers["X-Next-Cursor"] = encode_token({"d": jobs[-1]['distance_m'], "i": jobs[-1]['id']})
+    return job_rows.response(jobs, headers=headers)
+
+@api_router.get("/jobs/recommended/{worker_id}", response_model=List[Job])
+async def get_recommended_jobs(
+    worker_id: str,
+    location: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Open jobs matching a worker's skills, nearest location match first"""
+    worker = await db.users.find_one({"id": worker_id, "role": "worker"}, {"_id": 0, "skills": 1, "location": 1})
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker not found")
     
-    jobs = await db.jobs.find(query, {"_id": 0}).to_list(1000)
-    for job in jobs:
-        if isinstance(job['created_at'], str):
-            job['created_at'] = datetime.fromisoformat(job['created_at'])
-    return jobs
+    job_ids = job_matcher.recommend(worker.get("skills", []), location or worker.get("location"), limit=limit)
+    jobs = await db.jobs.find({"id": {"$in": job_ids}}, job_rows.projection).to_list(len(job_ids))
+    rank = {job_id: i for i, job_id in enumerate(job_ids)}
+    jobs.sort(key=lambda job: rank[job['id']])
+    return job_rows.response(jobs)
 
 @api_router.get("/jobs/{job_id}", response_model=Job)
 async def get_job(job_id: str):
     job = await db.jobs.find_one({"id": job_id}, {"_id": 0})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    if isinstance(job['created_at'], str):
-        job['created_at'] = datetime.fromisoformat(job['created_at'])
+
     return Job(**job)
 
 @api_router.post("/jobs", response_model=Job)
 async def create_job(job_data: JobCreate, current_user: dict = Depends(get_current_employer)):
     """Create new job - Employer only"""
     job = Job(**job_data.model_dump())
+    if job.geo is None:
+        # Cache-only lookup; uncached locations are resolved by geocoding.py
+        geo = await geocoder.cached(job.location)
+        job.geo = GeoPoint(**geo) if geo else None
     doc = job.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.jobs.insert_one(doc)
+    await rollups.record(db, {"jobs_created": 1}, job.created_at, category=job.category)
+    event_bus.publish_local("jobs", "insert", job.model_dump())
     return job
 
+@api_router.post("/jobs/bulk")
+async def create_jobs_bulk(request: Request, current_user: dict = Depends(get_current_employer)):
+    """Bulk create jobs - Employer only.
+
+    Accepts a JSON array, or a streamed NDJSON (application/x-ndjson) or CSV
+    (text/csv) upload. CSV rows may carry lat/lng columns for coordinates.
+    """
+    def build_job(row: dict) -> Job:
+        row = {**row, "employer_id": current_user["id"]}
+        row.setdefault("employer_name", current_user.get("name") or "")
+        if "lat" in row and "lng" in row:
+            row["geo"] = {"type": "Point", "coordinates": [float(row.pop("lng")), float(row.pop("lat"))]}
+        return Job(**JobCreate(**row).model_dump())
+    
+    async def on_inserted(jobs: List[Job]):
+        per_category = {}
+        for job in jobs:
+            per_category[job.category] = per_category.get(job.category, 0) + 1
+            event_bus.publish_local("jobs", "insert", job.model_dump())
+        for category, count in per_category.items():
+            await rollups.record(db, {"jobs_created": count}, jobs[0].created_at, category=category)
+    
+    try:
+        return await BulkJobImport(db.jobs, build_job, on_inserted).run(iter_rows(request))
+    except UploadError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 @api_router.post("/jobs/{job_id}/apply")
 async def apply_job(job_id: str, apply_data: JobApply, current_user: dict = Depends(get_current_worker)):
     """Apply for job - Worker only"""
-    job = await db.jobs.find_one({"id": job_id}, {"_id": 0})
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    if apply_data.worker_id != current_user["id"]:
+        raise HTTPException(status_code=403, detail="Workers can only apply for themselves")
     
-    if job['status'] != "open":
-        raise HTTPException(status_code=400, detail="Job is not available")
-    
-    await db.jobs.update_one(
-        {"id": job_id},
+    # Claim the job atomically so only one concurrent applicant can win
+    assigned_at = datetime.now(timezone.utc)
+    job = await db.jobs.find_one_and_update(
+        {"id": job_id, "status": "open"},
         {"$set": {
             "status": "assigned",
             "worker_id": apply_data.worker_id,
-            "worker_name": apply_data.worker_name
-        }}
+            "worker_name": apply_data.worker_name,
+            # main.py's worker dashboard matches jobs on the worker's email
+            "assigned_to": current_user["email"],
+            "assigned_at": assigned_at
+        }},
+        projection={"_id": 0, "title": 1, "category": 1}
     )
+    if not job:
+        if not await db.jobs.find_one({"id": job_id}, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=400, detail="Job is not available")
+    
+    dashboard_cache.invalidate(current_user["email"])
+    await rollups.record(
+        db, {"jobs_assigned": 1}, assigned_at,
+        worker=apply_data.worker_id, category=job.get('category')
+    )
+    event_bus.publish_local("jobs", "update", {
+        "id": job_id,
+        "title": job['title'],
+        "status": "assigned",
+        "worker_id": apply_data.worker_id,
+        "worker_name": apply_data.worker_name
+    })
     
     policy = SafetyPolicy(
         job_id=job_id,
@@ -404,110 +637,206 @@ async def apply_job(job_id: str, apply_data: JobApply, current_user: dict = Depe
         worker_name=apply_data.worker_name
     )
     policy_doc = policy.model_dump()
-    policy_doc['activated_at'] = policy_doc['activated_at'].isoformat()
-    await db.safety_policies.insert_one(policy_doc)
+    # Upsert keyed on job_id (unique index) keeps the policy insert idempotent
+    result = await db.safety_policies.update_one(
+        {"job_id": job_id},
+        {"$setOnInsert": policy_doc},
+        upsert=True
+    )
+    if result.upserted_id is None:
+        existing = await db.safety_policies.find_one({"job_id": job_id}, {"_id": 0, "id": 1})
+        return {"message": "Job applied successfully", "policy_id": existing['id']}
     
     return {"message": "Job applied successfully", "policy_id": policy.id}
 
+@api_router.post("/jobs/{job_id}/complete")
+async def complete_job(job_id: str, current_user: dict = Depends(get_current_employer)):
+    """Mark an assigned job completed - Employer only"""
+    job = await db.jobs.find_one(
+        {"id": job_id, "status": "assigned", "employer_id": current_user["id"]},
+        {"_id": 0, "worker_id": 1, "assigned_to": 1}
+    )
+    if not job:
+        raise HTTPException(status_code=400, detail="Job is not assigned to a worker")
+    
+    # Jobs assigned through main.py's apply route only record the worker's email
+    worker_filter = {"id": job['worker_id']} if job.get('worker_id') else {"email": job.get('assigned_to')}
+    worker = await db.users.find_one(worker_filter, {"_id": 0, "id": 1, "email": 1})
+    if not worker:
+        raise HTTPException(status_code=400, detail="Assigned worker not found")
+    
+    completed_at = datetime.now(timezone.utc)
+    claimed = await db.jobs.find_one_and_update(
+        {"id": job_id, "status": "assigned", "employer_id": current_user["id"]},
+        {"$set": {"status": "completed", "completed_at": completed_at}},
+        projection={"_id": 0, "category": 1}
+    )
+    if not claimed:
+        raise HTTPException(status_code=400, detail="Job is not assigned to a worker")
+    
+    await rollups.record(
+        db, {"jobs_completed": 1}, completed_at,
+        worker=worker['id'], category=claimed.get('category')
+    )
+    # main.py's worker dashboard is cached per assigned worker email
+    dashboard_cache.invalidate(worker['email'])
+    await record_job_completed(db.users, {"id": worker['id']})
+    event_bus.publish_local("jobs", "update", {"id": job_id, "status": "completed", "worker_id": worker['id']})
+    return {"message": "Job completed successfully"}
+
 @api_router.get("/jobs/worker/{worker_id}", response_model=List[Job])
 async def get_worker_jobs(worker_id: str):
-    jobs = await db.jobs.find({"worker_id": worker_id}, {"_id": 0}).to_list(1000)
-    for job in jobs:
-        if isinstance(job['created_at'], str):
-            job['created_at'] = datetime.fromisoformat(job['created_at'])
-    return jobs
+    jobs = await db.jobs.find({"worker_id": worker_id}, job_rows.projection).to_list(1000)
+    return job_rows.response(jobs)
 
 @api_router.get("/jobs/employer/{employer_id}", response_model=List[Job])
 async def get_employer_jobs(employer_id: str):
-    jobs = await db.jobs.find({"employer_id": employer_id}, {"_id": 0}).to_list(1000)
-    for job in jobs:
-        if isinstance(job['created_at'], str):
-            job['created_at'] = datetime.fromisoformat(job['created_at'])
-    return jobs
+    jobs = await db.jobs.find({"employer_id": employer_id}, job_rows.projection).to_list(1000)
+    return job_rows.response(jobs)
 
 # ===== WORKERS =====
-@api_router.get("/workers", response_model=List[User])
+@api_router.get("/workers", response_model=List[UserResponse])
 async def get_workers():
-    workers = await db.users.find({"role": "worker"}, {"_id": 0}).to_list(1000)
-    for worker in workers:
-        if isinstance(worker['created_at'], str):
-            worker['created_at'] = datetime.fromisoformat(worker['created_at'])
-    return workers
+    workers = await reads("get_workers").users.find({"role": "worker"}, user_rows.projection).to_list(1000)
+    return user_rows.response(workers)
 
-@api_router.get("/workers/{worker_id}", response_model=User)
+@api_router.get("/workers/{worker_id}", response_model=UserResponse)
 async def get_worker(worker_id: str):
-    worker = await db.users.find_one({"id": worker_id, "role": "worker"}, {"_id": 0})
+    # The projection lists UserResponse's fields only, so the password hash never leaves the database
+    worker = await db.users.find_one({"id": worker_id, "role": "worker"}, user_rows.projection)
     if not worker:
         raise HTTPException(status_code=404, detail="Worker not found")
-    
-    if isinstance(worker['created_at'], str):
-        worker['created_at'] = datetime.fromisoformat(worker['created_at'])
-    return User(**worker)
+
+    return UserResponse(**user_rows.row(worker))
 
 # ===== SAFETY POLICIES =====
 @api_router.get("/safety/policies/{worker_id}", response_model=List[SafetyPolicy])
 async def get_worker_policies(worker_id: str):
-    policies = await db.safety_policies.find({"worker_id": worker_id}, {"_id": 0}).to_list(1000)
-    for policy in policies:
-        if isinstance(policy['activated_at'], str):
-            policy['activated_at'] = datetime.fromisoformat(policy['activated_at'])
-    return policies
+    policies = await db.safety_policies.find({"worker_id": worker_id}, policy_rows.projection).to_list(1000)
+    return policy_rows.response(policies)
 
 @api_router.get("/safety/policy/{policy_id}", response_model=SafetyPolicy)
 async def get_policy(policy_id: str):
     policy = await db.safety_policies.find_one({"id": policy_id}, {"_id": 0})
     if not policy:
         raise HTTPException(status_code=404, detail="Policy not found")
-    
-    if isinstance(policy['activated_at'], str):
-        policy['activated_at'] = datetime.fromisoformat(policy['activated_at'])
+
     return SafetyPolicy(**policy)
 
 # ===== SOS =====
 @api_router.post("/sos/trigger", response_model=SOSAlert)
 async def trigger_sos(sos_data: SOSCreate):
+    triggered_at = time.perf_counter()
     sos = SOSAlert(**sos_data.model_dump())
     doc = sos.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.sos_alerts.insert_one(doc)
+    # Reserved pool and durable write concern; see database.sos_db
+    await sos_db.sos_alerts.insert_one(doc)
+    doc.pop('_id', None)
+    sos_dispatcher.enqueue(doc, triggered_at)
+    event_bus.publish_local("sos", "insert", doc)
+    # The alert is stored and dispatched; analytics must not hold the response on the main pool
+    rollups.record_in_background(db, {"sos_triggered": 1}, sos.created_at, worker=sos.worker_id)
     return sos
 
 @api_router.get("/sos/alerts/{worker_id}", response_model=List[SOSAlert])
 async def get_worker_alerts(worker_id: str):
-    alerts = await db.sos_alerts.find({"worker_id": worker_id}, {"_id": 0}).to_list(1000)
-    for alert in alerts:
-        if isinstance(alert['created_at'], str):
-            alert['created_at'] = datetime.fromisoformat(alert['created_at'])
-    return alerts
+    alerts = await db.sos_alerts.find({"worker_id": worker_id}, sos_rows.projection).to_list(1000)
+    return sos_rows.response(alerts)
+
+# ===== SEARCH =====
+@api_router.get("/search/jobs")
+async def search_jobs(
+    q: str = Query(..., min_length=1),
+    status: Optional[str] = "open",
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Ranked keyword search over job titles, categories and descriptions"""
+    query = {"$text": {"$search": q}}
+    if status:
+        query["status"] = status
+    
+    projection = {**job_rows.projection, "score": {"$meta": "textScore"}}
+    jobs = await db.jobs.find(query, projection) \
+        .sort([("score", {"$meta": "textScore"})]) \
+        .skip((page - 1) * limit) \
+        .limit(limit) \
+        .to_list(limit)
+    return job_rows.response(jobs)
+
+@api_router.get("/search/schemes")
+async def search_schemes(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Ranked (BM25) keyword search over the scheme catalog"""
+    return await scheme_catalog.search(q, offset=(page - 1) * limit, limit=limit)
+
+@api_router.get("/search/schemes/autocomplete")
+async def autocomplete_schemes(prefix: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)):
+    return {"suggestions": await scheme_catalog.autocomplete(prefix, limit)}
+
+# ===== EVENTS =====
+@api_router.get("/events/stream")
+async def stream_events(
+    topics: str = "sos,jobs",
+    worker_id: Optional[str] = None,
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """Server-Sent Events feed of SOS alerts and job updates.
+
+    Admins may watch the full feed or one worker; a worker only ever receives
+    events for their own worker_id.
+    """
+    wanted = {topic.strip() for topic in topics.split(",")} & set(TOPICS.values())
+    if not wanted:
+        raise HTTPException(status_code=400, detail="No valid topics requested")
+    if current_user["role"] == "worker":
+        if worker_id not in (None, current_user["id"]):
+            raise HTTPException(status_code=403, detail="Workers can only follow their own events")
+        worker_id = current_user["id"]
+    elif current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin or worker access required")
+    
+    subscription = event_bus.subscribe(wanted, worker_id=worker_id)
+    return StreamingResponse(
+        event_bus.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # ===== STATS =====
 @api_router.get("/stats/impact", response_model=ImpactStats)
 async def get_impact_stats():
-    total_workers = await db.users.count_documents({"role": "worker"})
-    total_jobs = await db.jobs.count_documents({})
-    policies_activated = await db.safety_policies.count_documents({})
-    sos_responded = await db.sos_alerts.count_documents({"status": {"$in": ["responded", "resolved"]}})
+    stats = await platform_stats.get()
     
     return ImpactStats(
-        total_workers=total_workers,
-        total_jobs=total_jobs,
-        policies_activated=policies_activated,
-        sos_responded=sos_responded
+        total_workers=stats["users"]["workers"],
+        total_jobs=stats["jobs"]["total"],
+        policies_activated=stats["policies"]["total"],
+        sos_responded=stats["sos"]["responded"]
     )
 
 
+@api_router.get("/stats/daily")
+async def get_daily_stats(
+    scope: Literal["platform", "worker", "category"] = "platform",
+    key: Optional[str] = None,
+    days: int = Query(7, ge=1, le=366)
+):
+    """Per-day counters from the daily rollups, oldest first"""
+    if scope != "platform" and not key:
+        raise HTTPException(status_code=400, detail="key is required for this scope")
+    return await rollups.read_rollups(reads("get_daily_stats"), scope=scope, key=key if scope != "platform" else None, days=days)
+
+
 # ===== ADMIN ONLY ENDPOINTS =====
 @api_router.get("/admin/users", response_model=List[UserResponse])
 async def get_all_users(current_user: dict = Depends(get_current_admin)):
     """Get all users - Admin only"""
-    users = await db.users.find({}, {"_id": 0}).to_list(1000)
-    result = []
-    for user in users:
-        if isinstance(user['created_at'], str):
-            user['created_at'] = datetime.fromisoformat(user['created_at'])
-        user_obj = User(**user)
-        result.append(UserResponse(**{k: v for k, v in user_obj.model_dump().items() if k != 'password'}))
-    return result
+    users = await db.users.find({}, user_rows.projection).to_list(1000)
+    return user_rows.response(users)
 
 @api_router.delete("/admin/users/{user_id}")
 async def delete_user(user_id: str, current_user: dict = Depends(get_current_admin)):
@@ -515,6 +844,7 @@ async def delete_user(user_id: str, current_user: dict = Depends(get_current_adm
     result = await db.users.delete_one({"id": user_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    principal_cache.revoke_user(user_id)
     return {"message": "User deleted successfully"}
 
 @api_router.patch("/admin/users/{user_id}/verify")
@@ -528,32 +858,60 @@ async def verify_user(user_id: str, current_user: dict = Depends(get_current_adm
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User verified successfully"}
 
+@api_router.get("/admin/password-hashing")
+async def get_password_hashing_stats(current_user: dict = Depends(get_current_admin)):
+    """Get password hashing pool queue depth - Admin only"""
+    return password_hasher.stats()
+
+@api_router.get("/admin/query-profile")
+async def get_query_profile(
+    limit: int = Query(20, ge=1, le=1000),
+    current_user: dict = Depends(get_current_admin)
+):
+    """Get MongoDB query shapes ranked by total time - Admin only"""
+    return query_profiler.report(limit)
+
+@api_router.post("/admin/query-profile/reset")
+async def reset_query_profile(current_user: dict = Depends(get_current_admin)):
+    """Clear the query profiler's counters - Admin only"""
+    query_profiler.reset()
+    return {"message": "Query profile reset"}
+
+@api_router.get("/admin/db-pool")
+async def get_db_pool_stats(current_user: dict = Depends(get_current_admin)):
+    """Get MongoDB connection pool saturation - Admin only"""
+    return {pool: monitor.stats() for pool, monitor in pool_monitors.items()}
+
+@api_router.post("/admin/ratings/reconcile")
+async def reconcile_ratings(current_user: dict = Depends(get_current_admin)):
+    """Rebuild rating aggregates from the ratings collection - Admin only"""
+    reconciled = await reconcile_rating_aggregates(db)
+    return {"message": "Rating aggregates reconciled", "users": reconciled}
+
+@api_router.get("/admin/sos/dispatch")
+async def get_sos_dispatch_stats(current_user: dict = Depends(get_current_admin)):
+    """Get SOS dispatch queue depth and latency - Admin only"""
+    return sos_dispatcher.stats()
+
 @api_router.get("/admin/stats")
 async def get_admin_stats(current_user: dict = Depends(get_current_admin)):
     """Get detailed admin statistics"""
-    total_users = await db.users.count_documents({})
-    total_workers = await db.users.count_documents({"role": "worker"})
-    total_employers = await db.users.count_documents({"role": "employer"})
-    total_jobs = await db.jobs.count_documents({})
-    active_jobs = await db.jobs.count_documents({"status": "assigned"})
-    completed_jobs = await db.jobs.count_documents({"status": "completed"})
-    total_policies = await db.safety_policies.count_documents({})
-    total_sos = await db.sos_alerts.count_documents({})
+    stats = await platform_stats.get()
     
     return {
         "users": {
-            "total": total_users,
-            "workers": total_workers,
-            "employers": total_employers
+            "total": stats["users"]["total"],
+            "workers": stats["users"]["workers"],
+            "employers": stats["users"]["employers"]
         },
         "jobs": {
-            "total": total_jobs,
-            "active": active_jobs,
-            "completed": completed_jobs
+            "total": stats["jobs"]["total"],
+            "active": stats["jobs"]["active"],
+            "completed": stats["jobs"]["completed"]
         },
         "safety": {
-            "policies_activated": total_policies,
-            "sos_alerts": total_sos
+            "policies_activated": stats["policies"]["total"],
+            "sos_alerts": stats["sos"]["total"]
         }
     }
 
@@ -569,6 +927,16 @@ async def update_worker_skills(worker_id: str, update: UpdateSkills):
         raise HTTPException(status_code=404, detail="Worker not found")
     return {"message": "Skills updated successfully"}
 
+@api_router.patch("/workers/{worker_id}/location")
+async def update_worker_location(worker_id: str, update: UpdateLocation):
+    changes = {"geo": update.geo.model_dump()}
+    if update.location is not None:
+        changes["location"] = update.location
+    result = await db.users.update_one({"id": worker_id, "role": "worker"}, {"$set": changes})
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Worker not found")
+    return {"message": "Location updated successfully"}
+
 @api_router.patch("/workers/{worker_id}/verification")
 async def update_verification(worker_id: str, update: UpdateVerification):
     result = await db.users.update_one(
@@ -584,33 +952,24 @@ async def update_verification(worker_id: str, update: UpdateVerification):
 async def create_rating(rating_data: RatingCreate):
     rating = Rating(**rating_data.model_dump())
     doc = rating.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.ratings.insert_one(doc)
+    await rollups.record(
+        db, {"ratings_received": 1, "rating_points": rating.rating}, rating.created_at,
+        worker=rating.ratee_id
+    )
     
-    ratings_cursor = db.ratings.find({"ratee_id": rating_data.ratee_id}, {"_id": 0, "rating": 1})
-    ratings = await ratings_cursor.to_list(1000)
-    
-    if ratings:
-        total_rating = sum(r['rating'] for r in ratings)
-        avg_rating = round(total_rating / len(ratings), 1)
-        
-        await db.users.update_one(
-            {"id": rating_data.ratee_id},
-            {"$set": {
-                "average_rating": avg_rating,
-                "total_ratings": len(ratings)
-            }}
-        )
+    # The new average also feeds the ratee's materialized trust score
+    await db.users.update_one(
+        {"id": rating_data.ratee_id},
+        add_rating_update(rating_data.rating) + trust_update({"rating": "$average_rating"})
+    )
     
     return rating
 
 @api_router.get("/ratings/user/{user_id}", response_model=List[Rating])
 async def get_user_ratings(user_id: str):
-    ratings = await db.ratings.find({"ratee_id": user_id}, {"_id": 0}).to_list(1000)
-    for rating in ratings:
-        if isinstance(rating['created_at'], str):
-            rating['created_at'] = datetime.fromisoformat(rating['created_at'])
-    return ratings
+    ratings = await reads("get_user_ratings").ratings.find({"ratee_id": user_id}, rating_rows.projection).to_list(1000)
+    return rating_rows.response(ratings)
 
 @api_router.get("/ratings/job/{job_id}")
 async def check_job_rated(job_id: str, user_id: str):
@@ -622,30 +981,26 @@ async def check_job_rated(job_id: str, user_id: str):
 
 # ===== GOVERNMENT SCHEMES (PHASE 2) =====
 @api_router.get("/schemes", response_model=List[Scheme])
-async def get_schemes(category: Optional[str] = None, state: Optional[str] = None):
-    query = {}
-    if category:
-        query["category"] = category
-    if state:
-        query["state"] = state
-    
-    schemes = await db.schemes.find(query, {"_id": 0}).to_list(1000)
-    for scheme in schemes:
-        if isinstance(scheme['created_at'], str):
-            scheme['created_at'] = datetime.fromisoformat(scheme['created_at'])
-    return schemes
+async def get_schemes(request: Request, category: Optional[str] = None, state: Optional[str] = None):
+    body, etag = await scheme_catalog.list(category=category or None, state=state or None)
+    return conditional_json_response(request, body, etag)
 
 @api_router.get("/schemes/{scheme_id}", response_model=Scheme)
-async def get_scheme(scheme_id: str):
-    scheme = await db.schemes.find_one({"id": scheme_id}, {"_id": 0})
-    if not scheme:
+async def get_scheme(request: Request, scheme_id: str):
+    cached = await scheme_catalog.get(scheme_id)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Scheme not found")
     
-    if isinstance(scheme['created_at'], str):
-        scheme['created_at'] = datetime.fromisoformat(scheme['created_at'])
-    return Scheme(**scheme)
+    body, etag = cached
+    return conditional_json_response(request, body, etag)
 
 app.include_router(api_router)
+app.include_router(worker_router)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -653,14 +1008,20 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Outermost, so its latency covers CORS handling and error responses too
+app.add_middleware(metrics.MetricsMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint"""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""SOS fan-out pipeline.
+
+Alerts are written through a dedicated Mongo client (see `database.sos_db`)
+and handed to an in-process queue. Dispatcher tasks fan each alert out to
+every configured notifier backend and record trigger-to-dispatch latency.
+"""
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier(ABC):
+    """Base class for SOS notifier backends"""
+
+    name = "base"
+
+    @abstractmethod
+    async def notify(self, alert: dict):
+        """Deliver one alert; raising marks this backend as failed for it"""
+
+
+class LogNotifier(Notifier):
+    """Local stub that only logs the alert"""
+
+    name = "log"
+
+    async def notify(self, alert: dict):
+        logger.warning(
+            f"SOS {alert['id']}: {alert['emergency_type']} for worker {alert['worker_id']} at {alert['location']}"
+        )
+
+
+NOTIFIERS = {LogNotifier.name: LogNotifier}
+
+
+def load_notifiers() -> list:
+    """Instantiate the notifiers named in SOS_NOTIFIERS (comma separated)"""
+    names = [n.strip() for n in os.environ.get("SOS_NOTIFIERS", "log").split(",") if n.strip()]
+    unknown = [name for name in names if name not in NOTIFIERS]
+    if unknown:
+        raise ValueError(
+            f"SOS_NOTIFIERS names unknown backend(s) {', '.join(unknown)}; "
+            f"valid backends are: {', '.join(sorted(NOTIFIERS))}"
+        )
+    return [NOTIFIERS[name]() for name in names]
+
+
+class SOSDispatcher:
+    def __init__(self, notifiers: list, workers: int = 2, samples: int = 1000):
+        self.notifiers = notifiers
+        self.workers = workers
+        self._queue = asyncio.Queue()
+        self._tasks = []
+        self._latencies = deque(maxlen=samples)
+        self._dispatched = 0
+        self._failures = 0
+
+    def enqueue(self, alert: dict, triggered_at: float):
+        """Queue an alert; `triggered_at` is the time.perf_counter() of the request"""
+        self._queue.put_nowait((alert, triggered_at))
+
+    async def _dispatch(self, alert: dict, triggered_at: float):
+        results = await asyncio.gather(
+            *(notifier.notify(alert) for notifier in self.notifiers),
+            return_exceptions=True
+        )
+        for notifier, result in zip(self.notifiers, results):
+            if isinstance(result, Exception):
+                self._failures += 1
+                logger.error(f"SOS notifier {notifier.name} failed for {alert['id']}: {result}")
+        self._dispatched += 1
+        self._latencies.append(time.perf_counter() - triggered_at)
+
+    async def _run(self):
+        while True:
+            alert, triggered_at = await self._queue.get()
+            try:
+                await self._dispatch(alert, triggered_at)
+            except Exception as exc:
+                logger.error(f"SOS dispatch failed for {alert.get('id')}: {exc}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 5.0):
+        """Drain queued alerts (up to `timeout` seconds), then stop the dispatcher tasks"""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Stopping with {self._queue.qsize()} SOS alerts undispatched")
+        for task in self._tasks:
+            task.cancel()
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            "queued": self._queue.qsize(),
+            "dispatched": self._dispatched,
+            "notifier_failures": self._failures,
+            "latency_ms": {"p50": percentile(0.50), "p99": percentile(0.99), "max": percentile(1.0)}
+        }
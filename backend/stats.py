@@ -0,0 +1,134 @@
+"""Platform statistics computed in one pass per collection and cached in-process."""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Async TTL cache; concurrent misses on one key share a single computation"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+        self._locks = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key, value):
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        if len(self._entries) > self.maxsize:
+            now = time.monotonic()
+            for stale in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                del self._entries[stale]
+            # Still full: evict the oldest insertions
+            while len(self._entries) > self.maxsize:
+                del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        # key -> [lock, callers holding or waiting on it]
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                # Another waiter may have filled the entry while we queued
+                value = self.get(key)
+                if value is None:
+                    value = await compute()
+                    self.set(key, value)
+        finally:
+            entry[1] -= 1
+            # A released lock may still have queued waiters; only the last caller drops it
+            if entry[1] == 0:
+                self._locks.pop(key, None)
+        return value
+
+
+def _count_if(field: str, values) -> dict:
+    if not isinstance(values, list):
+        values = [values]
+    return {"$sum": {"$cond": [{"$in": [f"${field}", values]}, 1, 0]}}
+
+
+async def _group_counts(collection, counters: dict) -> dict:
+    """Evaluate several counters over a collection in a single scan"""
+    fields = {counter[0] for counter in counters.values() if counter}
+    # Project away everything else so the scan can be covered by an index
+    pipeline = [{"$project": {"_id": 0, **{field: 1 for field in fields}}}] if fields else []
+    pipeline.append({"$group": {"_id": None, **{
+        name: _count_if(*counter) if counter else {"$sum": 1}
+        for name, counter in counters.items()
+    }}})
+    rows = await collection.aggregate(pipeline).to_list(1)
+    if not rows:
+        return {name: 0 for name in counters}
+    return {name: rows[0][name] for name in counters}
+
+
+async def compute_platform_stats(db) -> dict:
+    """Count users, jobs, policies and SOS alerts concurrently, one scan each"""
+    users, jobs, policies, sos = await asyncio.gather(
+        _group_counts(db.users, {
+            "total": None,
+            "workers": ("role", "worker"),
+            "employers": ("role", "employer"),
+        }),
+        _group_counts(db.jobs, {
+            "total": None,
+            "active": ("status", "assigned"),
+            "completed": ("status", "completed"),
+        }),
+        _group_counts(db.safety_policies, {"total": None}),
+        _group_counts(db.sos_alerts, {
+            "total": None,
+            "responded": ("status", ["responded", "resolved"]),
+        }),
+    )
+    return {"users": users, "jobs": jobs, "policies": policies, "sos": sos}
+
+
+class PlatformStats:
+    """Cached platform statistics with an optional background refresher"""
+
+    KEY = "platform"
+
+    def __init__(self, db, ttl: float):
+        self.db = db
+        self.cache = TTLCache(ttl)
+        self._refresher = None
+
+    async def get(self) -> dict:
+        return await self.cache.get_or_compute(self.KEY, lambda: compute_platform_stats(self.db))
+
+    async def _refresh_forever(self, interval: float):
+        while True:
+            try:
+                self.cache.set(self.KEY, await compute_platform_stats(self.db))
+            except Exception as exc:
+                logger.error(f"Stats refresh failed: {exc}")
+            await asyncio.sleep(interval)
+
+    def start_refresher(self, interval: float):
+        """Recompute stats every `interval` seconds so readers never miss"""
+        self._refresher = asyncio.create_task(self._refresh_forever(interval))
+
+    def stop_refresher(self):
+        if self._refresher:
+            self._refresher.cancel()
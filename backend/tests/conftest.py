@@ -0,0 +1,75 @@
+"""Shared fixtures: the server app on a throwaway database.
+
+Tests run against mongomock-motor by default. Set TEST_MONGO_URL to run them
+against a real mongod instead; a uniquely named database is created there
+and dropped afterwards.
+"""
+import asyncio
+import os
+import sys
+import uuid
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ["DB_NAME"] = f"swayam_test_{uuid.uuid4().hex[:8]}"
+
+import database  # noqa: E402
+
+
+class Api:
+    def __init__(self, loop, client):
+        self.loop = loop
+        self.client = client
+        self.db = database.db
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+
+@pytest.fixture(scope="session")
+def api():
+    import httpx
+
+    url = os.environ.get("TEST_MONGO_URL")
+    if url:
+        create_client = database.create_client
+        database.create_client = lambda *args, **options: create_client(url, *args[1:], **options)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        mock = AsyncMongoMockClient(tz_aware=True)
+        database.create_client = lambda *args, **options: mock
+
+    from server import app
+
+    loop = asyncio.new_event_loop()
+    stack = AsyncExitStack()
+
+    async def start():
+        await stack.enter_async_context(app.router.lifespan_context(app))
+        transport = httpx.ASGITransport(app=app)
+        return await stack.enter_async_context(httpx.AsyncClient(transport=transport, base_url="http://test"))
+
+    async def stop():
+        if url:
+            await database.client.drop_database(database.DB_NAME)
+        await stack.aclose()
+
+    client = loop.run_until_complete(start())
+    yield Api(loop, client)
+    loop.run_until_complete(stop())
+    loop.close()
+
+
+@pytest.fixture
+def bearer():
+    from auth import create_access_token
+
+    def headers(user: dict) -> dict:
+        token = create_access_token({"sub": user["id"], "email": user["email"], "role": user["role"], "name": user["name"]})
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
@@ -0,0 +1,35 @@
+import asyncio
+import random
+
+from seed_data import generate_jobs, generate_users
+
+APPLICANTS = 500
+
+
+def test_concurrent_applications_claim_job_once(api, bearer):
+    rng = random.Random(4)
+    employers = list(generate_users(1, "employer", "", rng))
+    workers = list(generate_users(APPLICANTS, "worker", "", rng))
+    job = next(generate_jobs(1, employers, rng))
+
+    async def scenario():
+        await api.db.jobs.insert_one(dict(job))
+        return await asyncio.gather(*(
+            api.client.post(
+                f"/api/jobs/{job['id']}/apply",
+                json={"worker_id": worker["id"], "worker_name": worker["name"]},
+                headers=bearer(worker),
+            )
+            for worker in workers
+        ))
+
+    responses = api.run(scenario())
+    statuses = [response.status_code for response in responses]
+    assert statuses.count(200) == 1
+    assert statuses.count(400) == APPLICANTS - 1
+
+    winner = workers[statuses.index(200)]
+    stored = api.run(api.db.jobs.find_one({"id": job["id"]}))
+    assert stored["status"] == "assigned"
+    assert stored["worker_id"] == winner["id"]
+    assert api.run(api.db.safety_policies.count_documents({"job_id": job["id"]})) == 1
@@ -0,0 +1,19 @@
+import time
+
+from auth import PrincipalCache
+
+
+def test_malformed_token_is_rejected(api):
+    response = api.run(api.client.get("/api/auth/me", headers={"Authorization": "Bearer not-a-jwt"}))
+    assert response.status_code == 401
+
+
+def test_revocations_are_dropped_after_the_token_lifetime():
+    cache = PrincipalCache(maxsize=10, token_lifetime=60)
+    cache.revoke_user("old")
+    cache._revoked["old"] -= 61
+    cache.revoke_user("recent")
+
+    assert set(cache._revoked) == {"recent"}
+    assert cache.is_revoked("recent", time.time() - 1)
+    assert not cache.is_revoked("old", time.time() - 1)
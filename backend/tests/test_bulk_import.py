@@ -0,0 +1,36 @@
+import json
+import random
+
+from seed_data import generate_users
+
+JOB = {
+    "title": "Cleaning job",
+    "category": "Cleaning",
+    "description": "Clean a flat",
+    "location": "HSR Layout, Bangalore",
+    "pay": 500,
+    "duration": "3 hours",
+}
+
+
+def employer():
+    return next(generate_users(1, "employer", "", random.Random(19)))
+
+
+def test_malformed_ndjson_line_does_not_drop_later_rows(api, bearer):
+    lines = [json.dumps(JOB), "{not json", *(json.dumps(JOB) for _ in range(4))]
+    response = api.run(api.client.post(
+        "/api/jobs/bulk",
+        content="\n".join(lines).encode(),
+        headers={**bearer(employer()), "Content-Type": "application/x-ndjson"},
+    ))
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows"], report["inserted"], report["failed"]) == (6, 5, 1)
+    assert report["errors"][0]["row"] == 2
+    assert report["errors"][0]["error"].startswith("line 2: invalid JSON")
+
+
+def test_json_body_that_is_not_an_array_is_rejected(api, bearer):
+    response = api.run(api.client.post("/api/jobs/bulk", json=JOB, headers=bearer(employer())))
+    assert response.status_code == 400
@@ -0,0 +1,89 @@
+import random
+
+import httpx
+import pytest
+
+import main
+from main import dashboard_cache
+from seed_data import generate_jobs, generate_users
+
+
+async def apply_through_server(api, bearer, job, worker):
+    body = {"worker_id": worker["id"], "worker_name": worker["name"]}
+    return await api.client.post(f"/api/jobs/{job['id']}/apply", json=body, headers=bearer(worker))
+
+
+async def apply_through_main(api, bearer, job, worker):
+    # main.app shares the database connection opened by the server lifespan
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        body = {"worker_email": worker["email"], "worker_name": worker["name"]}
+        return await client.post(f"/api/jobs/{job['id']}/apply", json=body)
+
+
+@pytest.mark.parametrize("apply", [apply_through_server, apply_through_main])
+def test_completing_an_applied_job(api, bearer, apply):
+    rng = random.Random(12)
+    employer = {**next(generate_users(1, "employer", "", rng)), "email": f"employer-{apply.__name__}@bench.swayam"}
+    worker = {**next(generate_users(1, "worker", "", rng)), "email": f"worker-{apply.__name__}@bench.swayam"}
+    job = next(generate_jobs(1, [employer], rng))
+
+    async def scenario():
+        await api.db.users.insert_many([dict(employer), dict(worker)])
+        await api.db.jobs.insert_one(dict(job))
+        applied = await apply(api, bearer, job, worker)
+        await api.client.get(f"/api/dashboard/{worker['email']}", headers=bearer(worker))
+        cached = dashboard_cache.get(worker["email"])
+        completed = await api.client.post(f"/api/jobs/{job['id']}/complete", headers=bearer(employer))
+        dropped = dashboard_cache.get(worker["email"]) is None
+        dashboard = (await api.client.get(f"/api/dashboard/{worker['email']}", headers=bearer(worker))).json()
+        weekly = (await api.client.get(f"/api/weekly-jobs/{worker['email']}", headers=bearer(worker))).json()
+        stored_job = await api.db.jobs.find_one({"id": job["id"]})
+        stored_worker = await api.db.users.find_one({"id": worker["id"]})
+        return applied, cached, completed, dropped, dashboard, weekly, stored_job, stored_worker
+
+    applied, cached, completed, dropped, dashboard, weekly, stored_job, stored_worker = api.run(scenario())
+    assert applied.status_code == 200
+    assert cached is not None
+    assert completed.status_code == 200
+    assert dropped
+    assert dashboard["completed_jobs"] == 1 and dashboard["in_progress"] == 0
+    assert sum(day["jobs"] for day in weekly) == 1
+    assert stored_job["status"] == "completed"
+    assert stored_worker["trust_metrics"]["completed_jobs"] == 1
+
+
+@pytest.mark.parametrize("apply", [apply_through_server, apply_through_main])
+def test_both_apply_routes_record_the_same_assignment(api, bearer, apply):
+    rng = random.Random(15)
+    employer = next(generate_users(1, "employer", "", rng))
+    worker = {**next(generate_users(1, "worker", "", rng)), "email": f"assigned-{apply.__name__}@bench.swayam"}
+    job = next(generate_jobs(1, [employer], rng))
+
+    async def scenario():
+        await api.db.users.insert_one(dict(worker))
+        await api.db.jobs.insert_one(dict(job))
+        applied = await apply(api, bearer, job, worker)
+        return applied, await api.db.jobs.find_one({"id": job["id"]})
+
+    applied, stored = api.run(scenario())
+    assert applied.status_code == 200
+    assert stored["worker_id"] == worker["id"]
+    assert stored["worker_name"] == worker["name"]
+    assert stored["assigned_to"] == worker["email"]
+
+
+def test_workers_cannot_apply_for_someone_else(api, bearer):
+    rng = random.Random(16)
+    employer = next(generate_users(1, "employer", "", rng))
+    worker, other = generate_users(2, "worker", "", rng)
+    job = next(generate_jobs(1, [employer], rng))
+
+    api.run(api.db.jobs.insert_one(dict(job)))
+    response = api.run(api.client.post(
+        f"/api/jobs/{job['id']}/apply",
+        json={"worker_id": other["id"], "worker_name": other["name"]},
+        headers=bearer(worker),
+    ))
+    assert response.status_code == 403
+    assert api.run(api.db.jobs.find_one({"id": job["id"]}))["status"] == "open"
@@ -0,0 +1,88 @@
+import asyncio
+import gzip
+import zlib
+
+from compression import CompressionMiddleware
+
+
+def run(app, method="GET"):
+    """Drive `app` once; returns the sent messages and how many bodies the app had sent at start"""
+    messages = []
+    sent_bodies = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append((message, len(sent_bodies)))
+
+    async def inner(scope, receive, send):
+        await app(scope, receive, send, sent_bodies)
+
+    scope = {"type": "http", "method": method, "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(inner, minimum_size=100)(scope, receive, send))
+    return messages
+
+
+def streaming(content_type, chunks, status=200):
+    async def app(scope, receive, send, sent_bodies):
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", content_type)]})
+        for i, chunk in enumerate(chunks):
+            sent_bodies.append(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+def fixed(body, status=200):
+    async def app(scope, receive, send, sent_bodies):
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        sent_bodies.append(body)
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+def headers_of(message):
+    return dict(message["headers"])
+
+
+def test_event_stream_starts_before_the_first_frame():
+    messages = run(streaming(b"text/event-stream", [b"data: 1\n\n", b"data: 2\n\n"]))
+    start, bodies_before = messages[0]
+    assert start["type"] == "http.response.start" and bodies_before == 0
+    assert b"content-encoding" not in headers_of(start)
+    assert b"".join(m.get("body", b"") for m, _ in messages[1:]) == b"data: 1\n\ndata: 2\n\n"
+
+
+def test_streamed_response_is_compressed_without_holding_back_the_start():
+    chunks = [b'{"row": %d}\n' % i * 20 for i in range(5)]
+    messages = run(streaming(b"application/x-ndjson", chunks))
+    start, bodies_before = messages[0]
+    assert bodies_before == 0
+    assert headers_of(start)[b"content-encoding"] == b"gzip"
+    assert gzip.decompress(b"".join(m.get("body", b"") for m, _ in messages[1:])) == b"".join(chunks)
+
+
+def test_each_streamed_chunk_is_decodable_on_arrival():
+    chunks = [b'{"row": %d}\n' % i * 20 for i in range(5)]
+    messages = run(streaming(b"application/x-ndjson", chunks))
+    decoder = zlib.decompressobj(31)
+    # Each chunk is flushed, so it decodes fully before the next one is sent
+    assert [decoder.decompress(m["body"]) for m, _ in messages[1:]] == chunks
+    assert decoder.eof
+
+
+def test_fixed_length_responses_by_size():
+    small = run(fixed(b"{}"))
+    assert b"content-encoding" not in headers_of(small[0][0])
+
+    body = b'{"jobs": "%s"}' % (b"x" * 500)
+    (start, _), (message, _) = run(fixed(body))
+    assert headers_of(start)[b"content-encoding"] == b"gzip"
+    assert int(headers_of(start)[b"content-length"]) == len(message["body"])
+    assert gzip.decompress(message["body"]) == body
+
+
+def test_bodiless_responses_pass_through():
+    for messages in (run(streaming(b"application/json", [b""], status=304)), run(fixed(b"x" * 500), method="HEAD")):
+        assert b"content-encoding" not in headers_of(messages[0][0])
@@ -0,0 +1,18 @@
+import pytest
+
+from pagination import encode_token
+
+
+@pytest.mark.parametrize("payload", [
+    {"d": True, "i": "a"},
+    {"d": -1, "i": "a"},
+    {"d": "5", "i": "a"},
+    {"d": 5.0, "i": 5},
+    {"d": 5.0},
+])
+def test_malformed_cursor_is_rejected(api, payload):
+    response = api.run(api.client.get(
+        "/api/jobs/nearby", params={"lat": 12.97, "lng": 77.59, "cursor": encode_token(payload)}
+    ))
+    assert response.status_code == 400
+    assert response.json()["error"]["message"] == "Invalid pagination cursor"
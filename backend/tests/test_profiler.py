@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import pytest
+
+import profiler
+from profiler import QueryProfiler
+
+
+@pytest.mark.parametrize("sample_rate", [0, -0.5, 1.5, float("nan")])
+def test_sample_rate_outside_unit_interval_is_rejected(sample_rate):
+    with pytest.raises(ValueError, match="QUERY_PROFILER_SAMPLE_RATE"):
+        QueryProfiler(enabled=True, sample_rate=sample_rate)
+
+
+def run_command(query_profiler, request_id, collection, filter, millis, returned):
+    command = {"find": collection, "filter": filter}
+    query_profiler.started(SimpleNamespace(
+        command_name="find", command=command, connection_id=("db", 27017), request_id=request_id
+    ))
+    query_profiler.succeeded(SimpleNamespace(
+        command_name="find", connection_id=("db", 27017), request_id=request_id,
+        duration_micros=millis * 1000, reply={"cursor": {"id": 0, "firstBatch": [{}] * returned}}
+    ))
+
+
+def test_report_with_a_valid_sample_rate(monkeypatch):
+    # Every command falls inside the sample
+    monkeypatch.setattr(profiler.random, "random", lambda: 0.0)
+    query_profiler = QueryProfiler(enabled=True, sample_rate=0.5)
+    for request_id in range(3):
+        run_command(query_profiler, request_id, "users", {"email": f"user{request_id}"}, 2, 1)
+    run_command(query_profiler, 3, "jobs", {"status": "open"}, 10, 5)
+
+    report = query_profiler.report()
+    assert report["sample_rate"] == 0.5
+    assert report["estimated_total_ms"] == 32
+    jobs, users = report["top"]
+    assert (jobs["collection"], users["collection"]) == ("jobs", "users")
+    assert (jobs["sampled"], jobs["count"], jobs["total_ms"], jobs["documents"]) == (1, 2, 20, 10)
+    assert (users["sampled"], users["count"], users["total_ms"], users["documents"]) == (3, 6, 12, 6)
+    assert users["avg_ms"] == 2 and users["max_ms"] == 2
@@ -0,0 +1,44 @@
+import os
+import random
+
+import pytest
+
+from auth import hash_password
+from seed_data import generate_users
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="mongomock has no $round")
+def test_rating_a_legacy_user_keeps_the_profile_readable(api, bearer):
+    rng = random.Random(13)
+    rater = {**next(generate_users(1, "employer", "", rng)), "email": "rater@bench.swayam"}
+    legacy = {
+        **next(generate_users(1, "worker", hash_password("secret"), rng)),
+        "email": "legacy-rated@bench.swayam",
+        "average_rating": 4.3,
+        "total_ratings": 3,
+    }
+    rating = {
+        "job_id": "legacy-job",
+        "job_title": "Legacy job",
+        "rater_id": rater["id"],
+        "rater_name": rater["name"],
+        "rater_role": "employer",
+        "ratee_id": legacy["id"],
+        "ratee_name": legacy["name"],
+        "ratee_role": "worker",
+        "rating": 5,
+    }
+
+    async def scenario():
+        await api.db.users.insert_many([dict(rater), dict(legacy)])
+        rated = await api.client.post("/api/ratings", json=rating)
+        login = await api.client.post("/api/auth/login", json={"email": legacy["email"], "password": "secret"})
+        me = await api.client.get("/api/auth/me", headers=bearer(legacy))
+        return rated, login, me, await api.db.users.find_one({"id": legacy["id"]})
+
+    rated, login, me, stored = api.run(scenario())
+    assert rated.status_code == 200
+    assert login.status_code == 200
+    assert me.status_code == 200
+    assert stored["rating_sum"] == 18 and stored["total_ratings"] == 4
+    assert me.json()["average_rating"] == 4.5
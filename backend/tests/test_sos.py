@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+import rollups
+import sos_dispatch
+
+
+def test_sos_is_stored_when_rollup_write_fails(api, monkeypatch):
+    async def failing_record(*args, **kwargs):
+        raise RuntimeError("main pool checkout timed out")
+
+    monkeypatch.setattr(rollups, "record", failing_record)
+
+    async def scenario():
+        response = await api.client.post("/api/sos/trigger", json={
+            "worker_id": "sos-worker",
+            "worker_name": "Worker",
+            "location": "Koramangala, Bangalore",
+            "emergency_type": "harassment",
+        })
+        # Let the background rollup write run and fail
+        await asyncio.sleep(0)
+        return response
+
+    response = api.run(scenario())
+    assert response.status_code == 200
+    assert api.run(api.db.sos_alerts.count_documents({"id": response.json()["id"]})) == 1
+
+
+def test_unknown_notifier_backend_is_a_configuration_error(monkeypatch):
+    monkeypatch.setenv("SOS_NOTIFIERS", "log,pager")
+    with pytest.raises(ValueError, match="pager.*valid backends are: log"):
+        sos_dispatch.load_notifiers()
+
+
+def test_notifier_backends_must_implement_notify():
+    class Incomplete(sos_dispatch.Notifier):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
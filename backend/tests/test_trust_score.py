@@ -0,0 +1,81 @@
+import random
+
+from seed_data import generate_jobs, generate_ratings, generate_users
+from trust_score import DEFAULT_METRICS, compute_trust_score
+
+
+def test_reconcile_refreshes_trust_score(api, bearer):
+    rng = random.Random(11)
+    admin = next(generate_users(1, "admin", "", rng))
+    employers = list(generate_users(1, "employer", "", rng))
+    rated, unrated = generate_users(2, "worker", "", rng)
+    ratings = list(generate_ratings(5, [rated], employers, rng))
+    # Stale aggregates the reconcile has to overwrite
+    unrated = {**unrated, "total_ratings": 3, "rating_sum": 6, "trust_metrics": {**DEFAULT_METRICS, "rating": 2.0}}
+
+    # Legacy document without an id, which the reconcile must leave alone
+    legacy = {"email": "legacy@bench.swayam", "role": "worker", "total_ratings": 2}
+
+    async def scenario():
+        await api.db.users.insert_many([dict(rated), unrated, dict(legacy)])
+        await api.db.ratings.insert_many(ratings)
+        response = await api.client.post("/api/admin/ratings/reconcile", headers=bearer(admin))
+        assert response.status_code == 200
+        return (
+            await api.db.users.find_one({"id": rated["id"]}),
+            await api.db.users.find_one({"id": unrated["id"]}),
+            await api.db.users.find_one({"email": legacy["email"]}),
+        )
+
+    rated, unrated, legacy = api.run(scenario())
+    average = round(sum(rating["rating"] for rating in ratings) / len(ratings), 1)
+    assert rated["trust_metrics"]["rating"] == average
+    assert rated["trust_score"] == compute_trust_score(rated["trust_metrics"])
+    assert unrated["total_ratings"] == 0
+    assert unrated["trust_metrics"]["rating"] == DEFAULT_METRICS["rating"]
+    assert unrated["trust_score"] == compute_trust_score(DEFAULT_METRICS)
+    assert legacy["total_ratings"] == 2
+
+
+def test_trusted_workers_requires_employer_and_hides_email(api, bearer):
+    rng = random.Random(12)
+    employer = next(generate_users(1, "employer", "", rng))
+    worker = {**next(generate_users(1, "worker", "", rng)), "email": "trusted@bench.swayam"}
+    api.run(api.db.users.insert_one(dict(worker)))
+
+    assert api.run(api.client.get("/api/trust-score")).status_code == 403
+    assert api.run(api.client.get("/api/trust-score", headers=bearer(worker))).status_code == 403
+    response = api.run(api.client.get("/api/trust-score", params={"limit": 1000}, headers=bearer(employer)))
+    assert response.status_code == 200
+    assert response.json() and all("email" not in row for row in response.json())
+    assert api.run(api.client.get(
+        "/api/trust-score", params={"limit": 1001}, headers=bearer(employer)
+    )).status_code == 422
+
+
+def test_workers_without_a_stored_score(api):
+    import httpx
+
+    import main
+    from trust_score import backfill_trust_scores
+
+    rng = random.Random(14)
+    employer = next(generate_users(1, "employer", "", rng))
+    worker = {**next(generate_users(1, "worker", "", rng)), "email": "unscored@bench.swayam"}
+    worker.pop("trust_score")
+    job = {**next(generate_jobs(1, [employer], rng)), "min_trust_score": 60}
+
+    async def scenario():
+        await api.db.users.insert_one(dict(worker))
+        await api.db.jobs.insert_one(dict(job))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            applied = await client.post(
+                f"/api/jobs/{job['id']}/apply",
+                json={"worker_email": worker["email"], "worker_name": worker["name"]},
+            )
+        await backfill_trust_scores(api.db.users, only_missing=True)
+        return applied, await api.db.users.find_one({"id": worker["id"]})
+
+    applied, stored = api.run(scenario())
+    assert applied.status_code == 200
+    assert stored["trust_score"] == compute_trust_score(worker["trust_metrics"])
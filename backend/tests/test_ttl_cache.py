@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from stats import TTLCache
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"total": 1}
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(20)))
+
+    assert asyncio.run(scenario()) == [{"total": 1}] * 20
+    assert len(calls) == 1
+    assert cache._locks == {}
+
+
+def test_failed_computation_releases_the_key():
+    cache = TTLCache(ttl=60)
+    attempts = []
+
+    async def compute():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # Every queued caller retried in turn, then the lock entry was dropped
+    assert len(attempts) == 5
+    assert cache._locks == {}
+
+    async def recovered():
+        return {"total": 2}
+
+    assert asyncio.run(cache.get_or_compute("k", recovered)) == {"total": 2}
+
+
+@pytest.mark.parametrize("waiters", [2, 10])
+def test_lock_is_kept_while_callers_wait(waiters):
+    cache = TTLCache(ttl=60)
+    seen = []
+
+    async def compute():
+        seen.append(len(cache._locks))
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def scenario():
+        # A zero TTL forces every caller to compute under the lock
+        cache.ttl = 0
+        await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(waiters)))
+
+    asyncio.run(scenario())
+    assert seen == [1] * waiters
+    assert cache._locks == {}
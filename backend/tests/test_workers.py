@@ -0,0 +1,32 @@
+import random
+
+from seed_data import generate_users
+
+
+def test_worker_profile_omits_password(api):
+    worker = {**next(generate_users(1, "worker", "bcrypt-hash", random.Random(9))), "email": "profile@bench.swayam"}
+    api.run(api.db.users.insert_one(dict(worker)))
+
+    response = api.run(api.client.get(f"/api/workers/{worker['id']}"))
+    assert response.status_code == 200
+    assert response.json()["id"] == worker["id"]
+    assert "password" not in response.json()
+
+
+def test_by_email_worker_routes_are_limited_to_that_worker_and_admins(api, bearer):
+    rng = random.Random(17)
+    worker, other = generate_users(2, "worker", "", rng)
+    worker = {**worker, "email": "own-data@bench.swayam"}
+    admin = next(generate_users(1, "admin", "", rng))
+    api.run(api.db.users.insert_one(dict(worker)))
+
+    for path, params in (
+        ("/api/onboarding/status", {"email": worker["email"]}),
+        (f"/api/trust-score/{worker['email']}", {}),
+        (f"/api/dashboard/{worker['email']}", {}),
+        (f"/api/weekly-jobs/{worker['email']}", {}),
+    ):
+        assert api.run(api.client.get(path, params=params)).status_code == 403
+        assert api.run(api.client.get(path, params=params, headers=bearer(other))).status_code == 403
+        assert api.run(api.client.get(path, params=params, headers=bearer(worker))).status_code == 200
+        assert api.run(api.client.get(path, params=params, headers=bearer(admin))).status_code == 200
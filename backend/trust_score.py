@@ -0,0 +1,76 @@
+"""Materialized worker trust score.
+
+`trust_score` is stored on the user document and recomputed inside the same
+atomic update that changes one of its inputs in `trust_metrics`, so reads and
+eligibility checks are a single indexed field lookup.
+
+Run `python trust_score.py` to backfill the field for existing users.
+"""
+import asyncio
+import os
+
+from dotenv import load_dotenv
+
+from database import create_client
+
+DEFAULT_METRICS = {"completed_jobs": 0, "rating": 5.0, "safety_score": 100}
+
+
+def compute_trust_score(metrics: dict) -> int:
+    """Python form of the score, for documents not yet backfilled"""
+    metrics = {**DEFAULT_METRICS, **(metrics or {})}
+    return min(
+        100,
+        int(40 + metrics["completed_jobs"]*5 + metrics["rating"]*5 + metrics["safety_score"]*0.2)
+    )
+
+
+DEFAULT_TRUST_SCORE = compute_trust_score(DEFAULT_METRICS)
+
+
+def _metric(name: str) -> dict:
+    return {"$ifNull": [f"$trust_metrics.{name}", DEFAULT_METRICS[name]]}
+
+
+# Aggregation form of compute_trust_score
+TRUST_SCORE_EXPR = {"$min": [100, {"$toInt": {"$trunc": {"$add": [
+    40,
+    {"$multiply": [_metric("completed_jobs"), 5]},
+    {"$multiply": [_metric("rating"), 5]},
+    {"$multiply": [_metric("safety_score"), 0.2]},
+]}}}]}
+
+
+def trust_update(metric_changes: dict) -> list:
+    """Pipeline stages that change trust metrics and re-derive trust_score"""
+    stages = []
+    if metric_changes:
+        stages.append({"$set": {f"trust_metrics.{k}": v for k, v in metric_changes.items()}})
+    stages.append({"$set": {"trust_score": TRUST_SCORE_EXPR}})
+    return stages
+
+
+async def record_job_completed(users, user_filter: dict):
+    await users.update_one(user_filter, trust_update({"completed_jobs": {"$add": [_metric("completed_jobs"), 1]}}))
+
+
+async def backfill_trust_scores(users, only_missing: bool = False) -> int:
+    """Re-derive trust_score; `only_missing` limits it to users that never had one"""
+    query = {"trust_score": {"$exists": False}} if only_missing else {}
+    result = await users.update_many(query, trust_update({}))
+    return result.modified_count
+
+
+async def main():
+    load_dotenv()
+    client = create_client()
+    db = client[os.environ["DB_NAME"]]
+
+    updated = await backfill_trust_scores(db.users)
+    print(f"Backfilled trust_score on {updated} users")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -37,29 +37,37 @@ const BrowseJobs = () => {
 
   const [jobs, setJobs] = useState([]);
   const [categoryFilter, setCategoryFilter] = useState("all");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
 
-  // Fetch Open Jobs
-  const fetchJobs = async () => {
+  // Fetch Open Jobs, one page at a time; the API returns the next page's cursor in X-Next-Cursor
+  const fetchJobs = async (cursor = null) => {
+    setLoading(true);
     try {
-      const response = await axios.get(`${API}/jobs?status=open`);
-      setJobs(response.data);
+      const params = { status: "open" };
+      if (categoryFilter !== "all") {
+        params.category = JOB_CATEGORIES.find(
+          (cat) => cat.toLowerCase() === categoryFilter
+        );
+      }
+      if (cursor) {
+        params.cursor = cursor;
+      }
+      const response = await axios.get(`${API}/jobs`, { params });
+      setJobs((previous) =>
+        cursor ? [...previous, ...response.data] : response.data
+      );
+      setNextCursor(response.headers["x-next-cursor"] || null);
     } catch (error) {
       console.error("Error fetching jobs:", error);
+    } finally {
+      setLoading(false);
     }
   };
 
   useEffect(() => {
     fetchJobs();
-  }, []);
-
-  const filteredJobs =
-    categoryFilter === "all"
-      ? jobs
-      : jobs.filter(
-          (job) =>
-            job.category?.toLowerCase() ===
-            categoryFilter.toLowerCase()
-        );
+  }, [categoryFilter]);
 
   return (
     <div className="min-h-screen bg-[#FFFBF7]">
@@ -104,10 +112,10 @@ const BrowseJobs = () => {
 
         {/* JOB GRID */}
         <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-6">
-          {filteredJobs.length === 0 ? (
+          {jobs.length === 0 ? (
             <EmptyState />
           ) : (
-            filteredJobs.map((job) => (
+            jobs.map((job) => (
               <JobCard
                 key={job.id}
                 job={job}
@@ -118,6 +126,18 @@ const BrowseJobs = () => {
             ))
           )}
         </div>
+
+        {nextCursor && (
+          <div className="mt-8 flex justify-center">
+            <Button
+              variant="outline"
+              disabled={loading}
+              onClick={() => fetchJobs(nextCursor)}
+            >
+              {loading ? "Loading..." : "Load more jobs"}
+            </Button>
+          </div>
+        )}
       </div>
     </div>
   );